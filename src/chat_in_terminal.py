@@ -24,6 +24,8 @@ if __name__ == "__main__":
 
         if user_input.lower() == 'exit':
             print("Goodbye!")
+            if chatbot_version == "v3":
+                chatbot.close()
             break
 
         # Get response from the chatbot
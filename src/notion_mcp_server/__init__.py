@@ -10,6 +10,7 @@ from .analytics_operations import AnalyticsOperations
 from .bulk_operations import BulkOperations
 from .notion_utils import NotionUtils
 from .update_operations import UpdateOperations
+from .api_client import NotionAPIClient, create_notion_client, create_notion_sync_client
 from .config import ServerConfig, get_config, validate_config, print_config
 
 __version__ = "2.0.0"
@@ -20,6 +21,9 @@ __all__ = [
     "BulkOperations", 
     "NotionUtils", 
     "UpdateOperations",
+    "NotionAPIClient",
+    "create_notion_client",
+    "create_notion_sync_client",
     "ServerConfig",
     "get_config",
     "validate_config", 
@@ -4,9 +4,12 @@ Advanced analytics and insights for Notion workspace
 """
 
 import os
+import asyncio
+from collections import Counter
+from itertools import islice
 from typing import Any, Dict, List, Optional, Union
 from datetime import datetime, timedelta, timezone
-from notion_client import Client
+from notion_client import AsyncClient
 from notion_client.errors import APIResponseError
 from .notion_utils import NotionUtils
 
@@ -14,20 +17,42 @@ from .notion_utils import NotionUtils
 class AnalyticsOperations:
     """Analytics operations for Notion API"""
     
-    def __init__(self, notion_client: Client):
+    def __init__(self, notion_client: AsyncClient):
         self.notion = notion_client
     
-    async def handle_analytics_requests(self, user_input: str):
+    async def _scan_all_pages(self) -> List[dict]:
+        """All workspace pages from one paginated scan, shared by the page-based reports
+        
+        Pages are reduced to NotionUtils.minimal_page dicts as they arrive.
+        """
+        return await NotionUtils.search_all(
+            self.notion,
+            filter_obj={"property": "object", "value": "page"},
+            transform=NotionUtils.minimal_page
+        )
+    
+    async def prefetch_workspace(self):
+        """Warm the shared page and database scans in the background so the next report starts from cache"""
+        # Reports and listings run the scans themselves if warming fails
+        await asyncio.gather(
+            self._scan_all_pages(),
+            NotionUtils.search_all(self.notion, filter_obj={"property": "object", "value": "database"}),
+            return_exceptions=True
+        )
+    
+    async def handle_analytics_requests(self, user_input: str, lowered: Optional[str] = None):
         """Handle analytics and metrics requests"""
+        if lowered is None:
+            lowered = user_input.lower()
         print("\n📊 Analytics & Metrics")
         
-        if 'workspace' in user_input.lower():
+        if 'workspace' in lowered:
             await self.run_workspace_analytics()
-        elif 'content' in user_input.lower():
+        elif 'content' in lowered:
             await self.run_content_analytics()
-        elif 'activity' in user_input.lower():
+        elif 'activity' in lowered:
             await self.run_activity_analytics()
-        elif 'database' in user_input.lower():
+        elif 'database' in lowered:
             await self.run_database_analytics()
         else:
             print("Available analytics:")
@@ -42,23 +67,23 @@ class AnalyticsOperations:
         
         try:
             # Gather data
-            pages = self.notion.search(filter={"property": "object", "value": "page"})
-            databases = self.notion.search(filter={"property": "object", "value": "database"})
+            pages = await self._scan_all_pages()
+            databases = await NotionUtils.search_all(self.notion, filter_obj={"property": "object", "value": "database"})
             
             # Calculate metrics
-            total_pages = len(pages["results"])
-            total_databases = len(databases["results"])
+            total_pages = len(pages)
+            total_databases = len(databases)
             
             # Recent activity (last 7 days) - use timezone-aware datetime
             week_ago = datetime.now(timezone.utc) - timedelta(days=7)
             recent_pages = []
             
-            for page in pages["results"]:
+            for page in pages:
                 try:
-                    last_edited = datetime.fromisoformat(page["last_edited_time"].replace("Z", "+00:00"))
+                    last_edited = NotionUtils.parse_timestamp(page["last_edited_time"])
                     if last_edited > week_ago:
                         recent_pages.append({
-                            "title": NotionUtils.extract_title(page),
+                            "title": page["title"],
                             "last_edited": page["last_edited_time"],
                             "id": page["id"]
                         })
@@ -70,18 +95,22 @@ class AnalyticsOperations:
             recent_pages.sort(key=lambda x: x["last_edited"], reverse=True)
             
             # Display results
-            print(f"\n📈 Workspace Analytics Results:")
-            print(f"├── 📄 Total Pages: {total_pages}")
-            print(f"├── 🗄️  Total Databases: {total_databases}")
-            print(f"├── 📅 Recent Activity (7 days): {len(recent_pages)} pages")
-            print(f"└── 🔥 Most Active Period: Last 7 days")
+            lines = [
+                f"\n📈 Workspace Analytics Results:",
+                f"├── 📄 Total Pages: {total_pages}",
+                f"├── 🗄️  Total Databases: {total_databases}",
+                f"├── 📅 Recent Activity (7 days): {len(recent_pages)} pages",
+                f"└── 🔥 Most Active Period: Last 7 days"
+            ]
             
             if recent_pages:
-                print(f"\n🔥 Most Recently Updated Pages:")
+                lines.append(f"\n🔥 Most Recently Updated Pages:")
                 for i, page in enumerate(recent_pages[:10], 1):
-                    print(f"  {i}. {page['title']}")
-                    print(f"     📅 {page['last_edited']}")
-                    print(f"     🆔 {page['id']}")
+                    lines.append(f"  {i}. {page['title']}")
+                    lines.append(f"     📅 {page['last_edited']}")
+                    lines.append(f"     🆔 {page['id']}")
+            
+            NotionUtils.write_lines(lines)
             
         except Exception as e:
             print(f"❌ Analytics error: {e}")
@@ -93,22 +122,33 @@ class AnalyticsOperations:
         print("\n📝 Content Analytics...")
         
         try:
-            pages = self.notion.search(filter={"property": "object", "value": "page"})
+            pages = await self._scan_all_pages()
             
             # Content analysis
             content_stats = {
-                "total_pages": len(pages["results"]),
+                "total_pages": len(pages),
                 "pages_with_content": 0,
                 "empty_pages": 0,
                 "avg_blocks_per_page": 0,
-                "content_types": {}
+                "content_types": Counter()
             }
             
             total_blocks = 0
             
-            for page in pages["results"][:20]:  # Analyze first 20 pages
+            # Archived pages have no live content to analyze, so skip them before fetching blocks
+            sample = list(islice((page for page in pages if not page["archived"]), 20))
+            
+            # Fetch blocks for the first 20 pages concurrently
+            block_results = await NotionUtils.gather_bounded([
+                NotionUtils.list_block_children(self.notion, page["id"])
+                for page in sample
+            ])
+            
+            for blocks in block_results:
+                if isinstance(blocks, Exception):
+                    continue
+                
                 try:
-                    blocks = self.notion.blocks.children.list(page["id"])
                     block_count = len(blocks["results"])
                     total_blocks += block_count
                     
@@ -118,9 +158,7 @@ class AnalyticsOperations:
                         content_stats["empty_pages"] += 1
                     
                     # Analyze block types
-                    for block in blocks["results"]:
-                        block_type = block.get("type", "unknown")
-                        content_stats["content_types"][block_type] = content_stats["content_types"].get(block_type, 0) + 1
+                    content_stats["content_types"].update(block.get("type", "unknown") for block in blocks["results"])
                         
                 except Exception:
                     continue
@@ -128,15 +166,20 @@ class AnalyticsOperations:
             if content_stats["pages_with_content"] > 0:
                 content_stats["avg_blocks_per_page"] = total_blocks / content_stats["pages_with_content"]
             
-            print(f"\n📊 Content Analysis Results:")
-            print(f"├── 📄 Total Pages Analyzed: {min(20, content_stats['total_pages'])}")
-            print(f"├── ✅ Pages with Content: {content_stats['pages_with_content']}")
-            print(f"├── 📭 Empty Pages: {content_stats['empty_pages']}")
-            print(f"├── 📊 Avg Blocks per Page: {content_stats['avg_blocks_per_page']:.1f}")
-            print(f"└── 🧩 Content Types:")
+            lines = [
+                f"\n📊 Content Analysis Results:",
+                f"├── 📄 Total Pages Analyzed: {len(sample)}",
+                f"├── ✅ Pages with Content: {content_stats['pages_with_content']}",
+                f"├── 📭 Empty Pages: {content_stats['empty_pages']}",
+                f"├── 📊 Avg Blocks per Page: {content_stats['avg_blocks_per_page']:.1f}",
+                f"└── 🧩 Content Types:"
+            ]
+            lines.extend(
+                f"    • {content_type}: {count}"
+                for content_type, count in content_stats["content_types"].most_common()
+            )
             
-            for content_type, count in sorted(content_stats["content_types"].items(), key=lambda x: x[1], reverse=True):
-                print(f"    • {content_type}: {count}")
+            NotionUtils.write_lines(lines)
             
         except Exception as e:
             print(f"❌ Content analytics error: {e}")
@@ -146,7 +189,7 @@ class AnalyticsOperations:
         print("\n🔄 Activity Analytics...")
         
         try:
-            pages = self.notion.search(filter={"property": "object", "value": "page"})
+            pages = await self._scan_all_pages()
             
             # Activity analysis - use timezone-aware datetime
             now = datetime.now(timezone.utc)
@@ -157,16 +200,20 @@ class AnalyticsOperations:
                 "older": []
             }
             
-            for page in pages["results"]:
+            # Bucket boundaries, computed once: edited < 1, <= 7 and <= 30 whole days ago
+            today_cutoff = now - timedelta(days=1)
+            week_cutoff = now - timedelta(days=8)
+            month_cutoff = now - timedelta(days=31)
+            
+            for page in pages:
                 try:
-                    last_edited = datetime.fromisoformat(page["last_edited_time"].replace("Z", "+00:00"))
-                    days_ago = (now - last_edited).days
+                    last_edited = NotionUtils.parse_timestamp(page["last_edited_time"])
                     
-                    if days_ago == 0:
+                    if last_edited > today_cutoff:
                         activity_buckets["today"].append(page)
-                    elif days_ago <= 7:
+                    elif last_edited > week_cutoff:
                         activity_buckets["this_week"].append(page)
-                    elif days_ago <= 30:
+                    elif last_edited > month_cutoff:
                         activity_buckets["this_month"].append(page)
                     else:
                         activity_buckets["older"].append(page)
@@ -174,17 +221,20 @@ class AnalyticsOperations:
                     # Skip pages with invalid dates
                     activity_buckets["older"].append(page)
             
-            print(f"\n📊 Activity Pattern Analysis:")
-            print(f"├── 📅 Today: {len(activity_buckets['today'])} pages")
-            print(f"├── 🗓️  This Week: {len(activity_buckets['this_week'])} pages")
-            print(f"├── 📆 This Month: {len(activity_buckets['this_month'])} pages")
-            print(f"└── 🗂️  Older: {len(activity_buckets['older'])} pages")
+            lines = [
+                f"\n📊 Activity Pattern Analysis:",
+                f"├── 📅 Today: {len(activity_buckets['today'])} pages",
+                f"├── 🗓️  This Week: {len(activity_buckets['this_week'])} pages",
+                f"├── 📆 This Month: {len(activity_buckets['this_month'])} pages",
+                f"└── 🗂️  Older: {len(activity_buckets['older'])} pages"
+            ]
             
             # Show most active day
             if activity_buckets["today"]:
-                print(f"\n🔥 Today's Activity:")
-                for page in activity_buckets["today"][:5]:
-                    print(f"  • {NotionUtils.extract_title(page)}")
+                lines.append(f"\n🔥 Today's Activity:")
+                lines.extend(f"  • {page['title']}" for page in activity_buckets["today"][:5])
+            
+            NotionUtils.write_lines(lines)
             
         except Exception as e:
             print(f"❌ Activity analytics error: {e}")
@@ -196,34 +246,44 @@ class AnalyticsOperations:
         print("\n🗄️ Database Analytics...")
         
         try:
-            databases = self.notion.search(filter={"property": "object", "value": "database"})
+            databases = await NotionUtils.search_all(self.notion, filter_obj={"property": "object", "value": "database"})
             
             db_stats = {
-                "total_databases": len(databases["results"]),
-                "property_types": {},
+                "total_databases": len(databases),
+                "property_types": Counter(),
                 "database_sizes": []
             }
             
-            for db in databases["results"]:
+            # Get database details concurrently
+            db_infos = await NotionUtils.gather_bounded([
+                NotionUtils.retrieve_database(self.notion, db["id"])
+                for db in databases
+            ])
+            
+            for db_info in db_infos:
+                if isinstance(db_info, Exception):
+                    continue
+                
                 try:
-                    # Get database details
-                    db_info = self.notion.databases.retrieve(db["id"])
                     properties = db_info.get("properties", {})
                     
                     # Count property types
-                    for prop_name, prop_info in properties.items():
-                        prop_type = prop_info.get("type", "unknown")
-                        db_stats["property_types"][prop_type] = db_stats["property_types"].get(prop_type, 0) + 1
+                    db_stats["property_types"].update(prop_info.get("type", "unknown") for prop_info in properties.values())
                     
                 except Exception:
                     continue
             
-            print(f"\n📊 Database Structure Analysis:")
-            print(f"├── 🗄️  Total Databases: {db_stats['total_databases']}")
-            print(f"└── 🏷️  Property Types Used:")
+            lines = [
+                f"\n📊 Database Structure Analysis:",
+                f"├── 🗄️  Total Databases: {db_stats['total_databases']}",
+                f"└── 🏷️  Property Types Used:"
+            ]
+            lines.extend(
+                f"    • {prop_type}: {count}"
+                for prop_type, count in db_stats["property_types"].most_common()
+            )
             
-            for prop_type, count in sorted(db_stats["property_types"].items(), key=lambda x: x[1], reverse=True):
-                print(f"    • {prop_type}: {count}")
+            NotionUtils.write_lines(lines)
             
         except Exception as e:
             print(f"❌ Database analytics error: {e}") 
\ No newline at end of file
@@ -7,6 +7,8 @@ import os
 import asyncio
 import json
 import logging
+from collections import Counter
+from itertools import islice
 from typing import Any, Dict, List, Optional, Union
 from datetime import datetime, timedelta, timezone
 from contextlib import asynccontextmanager
@@ -15,8 +17,8 @@ from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 import uvicorn
 from dotenv import load_dotenv
-from notion_client import Client
 from notion_client.errors import APIResponseError
+from .api_client import create_notion_client
 from .notion_utils import NotionUtils
 from .serverV2 import ComprehensiveNotionServer
 
@@ -51,13 +53,18 @@ async def lifespan(app: FastAPI):
         
         # Test Notion API connection
         logger.info("🔗 Testing Notion API connection...")
-        test_client = Client(auth=config.notion_token)
-        user_info = test_client.users.me()
+        test_client = create_notion_client(config.notion_token)
+        try:
+            user_info = await test_client.users.me()
+        except Exception:
+            # The server never takes ownership of a client that failed the probe
+            await test_client.aclose()
+            raise
         logger.info(f"✅ Notion API connection successful! User: {user_info.get('name', 'N/A')}")
         
         # Initialize server
         logger.info("🚀 Initializing Notion MCP Server...")
-        notion_server = ComprehensiveNotionServer(config.notion_token)
+        notion_server = ComprehensiveNotionServer(config.notion_token, client=test_client)
         logger.info("✅ Notion MCP Server initialized successfully!")
         
         yield
@@ -69,6 +76,9 @@ async def lifespan(app: FastAPI):
     finally:
         # Shutdown
         logger.info("🛑 Shutting down Notion MCP Server...")
+        if notion_server is not None:
+            # Release the pooled HTTP connections
+            await notion_server.notion.aclose()
         notion_server = None
         logger.info("✅ Server shutdown complete")
 
@@ -133,7 +143,7 @@ async def health_check():
         
         # Test Notion API connection
         try:
-            user_info = notion_server.notion.users.me()
+            user_info = await notion_server.notion.users.me()
             user_name = user_info.get("name", "Unknown")
             
             return {
@@ -201,7 +211,7 @@ async def search_content(request: SearchRequest):
             raise HTTPException(status_code=503, detail="Server not initialized")
         
         # Use the server's search method
-        results = notion_server.notion.search(
+        results = await notion_server.notion.search(
             query=request.query,
             page_size=request.page_size
         )
@@ -257,7 +267,7 @@ async def read_page(request: ReadPageRequest):
         
         # If identifier is not a UUID, search for it
         if not NotionUtils.is_valid_uuid(page_id):
-            search_results = notion_server.notion.search(
+            search_results = await notion_server.notion.search(
                 query=page_id,
                 filter={"property": "object", "value": "page"}
             )
@@ -270,7 +280,7 @@ async def read_page(request: ReadPageRequest):
             # For UUID-like identifiers, validate by attempting to retrieve the page first
             try:
                 # Test if the page exists by attempting to retrieve it
-                test_page = notion_server.notion.pages.retrieve(page_id)
+                test_page = await NotionUtils.retrieve_page(notion_server.notion, page_id)
                 if not test_page:
                     raise HTTPException(status_code=404, detail=f"Invalid page ID: {page_id}")
             except Exception as e:
@@ -283,10 +293,10 @@ async def read_page(request: ReadPageRequest):
                     raise e
         
         # Get page details
-        page = notion_server.notion.pages.retrieve(page_id)
+        page = await NotionUtils.retrieve_page(notion_server.notion, page_id)
         
         # Get page content (blocks)
-        blocks = notion_server.notion.blocks.children.list(page_id)
+        blocks = await NotionUtils.list_block_children(notion_server.notion, page_id)
         
         # Format page data
         formatted_page = {
@@ -343,7 +353,7 @@ async def create_page(request: CreatePageRequest):
         # Get parent ID
         parent_id = request.parent_id
         if not parent_id:
-            parent_id = NotionUtils.get_suitable_parent_sync(notion_server.notion)
+            parent_id = await NotionUtils.get_suitable_parent(notion_server.notion)
             if not parent_id:
                 raise HTTPException(status_code=400, detail="No suitable parent found and none provided")
         
@@ -376,7 +386,8 @@ async def create_page(request: CreatePageRequest):
             page_data["children"] = children
         
         # Create the page
-        page = notion_server.notion.pages.create(**page_data)
+        page = await notion_server.notion.pages.create(**page_data)
+        NotionUtils.invalidate_search_cache()
         
         return APIResponse(
             success=True,
@@ -430,7 +441,7 @@ async def add_content(request: AddContentRequest):
         
         # Validate page exists
         try:
-            test_page = notion_server.notion.pages.retrieve(page_id)
+            test_page = await NotionUtils.retrieve_page(notion_server.notion, page_id)
             if not test_page:
                 raise HTTPException(status_code=404, detail=f"Invalid page ID: {page_id}")
         except Exception as e:
@@ -488,16 +499,17 @@ async def add_content(request: AddContentRequest):
             target_page_id = request.page_reference.strip()
             if not NotionUtils.is_valid_uuid(target_page_id):
                 # Search for page by title - need exact match
-                search_results = notion_server.notion.search(
+                search_results = await notion_server.notion.search(
                     query=target_page_id,
                     filter={"property": "object", "value": "page"}
                 )
                 
                 # Check for exact title match
                 found_page = None
+                target_title = target_page_id.lower()
                 for page in search_results.get("results", []):
                     page_title = NotionUtils.extract_title(page)
-                    if page_title.lower() == target_page_id.lower():  # Case-insensitive exact match
+                    if page_title.lower() == target_title:  # Case-insensitive exact match
                         found_page = page
                         break
                 
@@ -508,7 +520,7 @@ async def add_content(request: AddContentRequest):
             else:
                 # Validate target page exists
                 try:
-                    test_target_page = notion_server.notion.pages.retrieve(target_page_id)
+                    test_target_page = await NotionUtils.retrieve_page(notion_server.notion, target_page_id)
                     if not test_target_page:
                         raise HTTPException(status_code=404, detail=f"Target page not found: {target_page_id}")
                 except Exception as e:
@@ -549,10 +561,11 @@ async def add_content(request: AddContentRequest):
                 blocks.append(block)
         
         # Add blocks to page
-        response = notion_server.notion.blocks.children.append(
+        response = await notion_server.notion.blocks.children.append(
             block_id=page_id,
             children=blocks
         )
+        NotionUtils.invalidate_search_cache()
         
         return APIResponse(
             success=True,
@@ -604,7 +617,7 @@ async def bulk_add_content(request: BulkAddContentRequest):
         
         # Validate page exists
         try:
-            test_page = notion_server.notion.pages.retrieve(page_id)
+            test_page = await NotionUtils.retrieve_page(notion_server.notion, page_id)
             if not test_page:
                 raise HTTPException(status_code=404, detail=f"Invalid page ID: {page_id}")
         except Exception as e:
@@ -625,7 +638,10 @@ async def bulk_add_content(request: BulkAddContentRequest):
         blocks = []
         valid_types = ["paragraph", "heading_1", "heading_2", "heading_3", "bulleted_list_item", "to_do", "bookmark", "link_to_page"]
         
+        item_block_counts = []  # blocks produced by each item, in order
+        
         for i, item in enumerate(request.items):
+            blocks_before = len(blocks)
             content_type = item.get("content_type", "paragraph")
             content = item.get("content", "")
             checked = item.get("checked", False)
@@ -663,16 +679,17 @@ async def bulk_add_content(request: BulkAddContentRequest):
                 target_page_id = str(page_reference).strip()
                 if not NotionUtils.is_valid_uuid(target_page_id):
                     # Search for page by title - need exact match
-                    search_results = notion_server.notion.search(
+                    search_results = await notion_server.notion.search(
                         query=target_page_id,
                         filter={"property": "object", "value": "page"}
                     )
                     
                     # Check for exact title match
                     found_page = None
+                    target_title = target_page_id.lower()
                     for page in search_results.get("results", []):
                         page_title = NotionUtils.extract_title(page)
-                        if page_title.lower() == target_page_id.lower():  # Case-insensitive exact match
+                        if page_title.lower() == target_title:  # Case-insensitive exact match
                             found_page = page
                             break
                     
@@ -683,7 +700,7 @@ async def bulk_add_content(request: BulkAddContentRequest):
                 else:
                     # Validate target page exists
                     try:
-                        test_target_page = notion_server.notion.pages.retrieve(target_page_id)
+                        test_target_page = await NotionUtils.retrieve_page(notion_server.notion, target_page_id)
                         if not test_target_page:
                             raise HTTPException(status_code=404, detail=f"Target page not found in item {i+1}: {target_page_id}")
                     except Exception as e:
@@ -725,12 +742,31 @@ async def bulk_add_content(request: BulkAddContentRequest):
                         block[content_type]["checked"] = checked
                     
                     blocks.append(block)
+            
+            item_block_counts.append(len(blocks) - blocks_before)
         
         # Add blocks to page
-        response = notion_server.notion.blocks.children.append(
+        response = await notion_server.notion.blocks.children.append(
             block_id=page_id,
             children=blocks
         )
+        NotionUtils.invalidate_search_cache()
+        
+        block_ids = [block["id"] for block in response["results"]]
+        
+        # Per-item outcome, so callers can tell which items actually produced blocks
+        item_results = []
+        offset = 0
+        for i, (item, count) in enumerate(zip(request.items, item_block_counts)):
+            item_block_ids = block_ids[offset:offset + count]
+            offset += count
+            item_results.append({
+                "index": i,
+                "content_type": item.get("content_type", "paragraph"),
+                "success": count > 0 and len(item_block_ids) == count,
+                "blocks_added": len(item_block_ids),
+                "block_ids": item_block_ids
+            })
         
         return APIResponse(
             success=True,
@@ -738,7 +774,8 @@ async def bulk_add_content(request: BulkAddContentRequest):
                 "page_id": page_id,
                 "items_processed": len(request.items),
                 "blocks_added": len(blocks),
-                "block_ids": [block["id"] for block in response["results"]]
+                "block_ids": block_ids,
+                "item_results": item_results
             },
             message=f"Added {len(blocks)} blocks from {len(request.items)} items to page"
         )
@@ -768,8 +805,8 @@ async def get_analytics(request: AnalyticsRequest):
         # Get actual structured data instead of captured output
         if request.type == "workspace":
             # Get pages and databases directly
-            pages = notion_server.notion.search(filter={"property": "object", "value": "page"})
-            databases = notion_server.notion.search(filter={"property": "object", "value": "database"})
+            pages = await notion_server.notion.search(filter={"property": "object", "value": "page"})
+            databases = await notion_server.notion.search(filter={"property": "object", "value": "database"})
             
             # Calculate recent activity (last 7 days)
             week_ago = datetime.now(timezone.utc) - timedelta(days=7)
@@ -777,7 +814,7 @@ async def get_analytics(request: AnalyticsRequest):
             
             for page in pages.get("results", []):
                 try:
-                    last_edited = datetime.fromisoformat(page["last_edited_time"].replace("Z", "+00:00"))
+                    last_edited = NotionUtils.parse_timestamp(page["last_edited_time"])
                     if last_edited > week_ago:
                         recent_pages.append({
                             "title": NotionUtils.extract_title(page),
@@ -797,21 +834,23 @@ async def get_analytics(request: AnalyticsRequest):
             }
             
         elif request.type == "content":
-            pages = notion_server.notion.search(filter={"property": "object", "value": "page"})
+            pages = await notion_server.notion.search(filter={"property": "object", "value": "page"})
             
             content_stats = {
                 "total_pages": len(pages.get("results", [])),
                 "pages_with_content": 0,
                 "empty_pages": 0,
-                "content_types": {}
+                "content_types": Counter()
             }
             
             total_blocks = 0
             pages_analyzed = 0
             
-            for page in pages.get("results", [])[:20]:  # Analyze first 20 pages
+            # Analyze the first 20 pages, skipping archived ones before fetching blocks
+            live_pages = (page for page in pages.get("results", []) if not page.get("archived"))
+            for page in islice(live_pages, 20):
                 try:
-                    blocks = notion_server.notion.blocks.children.list(page["id"])
+                    blocks = await NotionUtils.list_block_children(notion_server.notion, page["id"])
                     block_count = len(blocks.get("results", []))
                     total_blocks += block_count
                     pages_analyzed += 1
@@ -822,9 +861,7 @@ async def get_analytics(request: AnalyticsRequest):
                         content_stats["empty_pages"] += 1
                     
                     # Analyze block types
-                    for block in blocks.get("results", []):
-                        block_type = block.get("type", "unknown")
-                        content_stats["content_types"][block_type] = content_stats["content_types"].get(block_type, 0) + 1
+                    content_stats["content_types"].update(block.get("type", "unknown") for block in blocks.get("results", []))
                         
                 except Exception:
                     continue
@@ -833,6 +870,7 @@ async def get_analytics(request: AnalyticsRequest):
                 content_stats["avg_blocks_per_page"] = total_blocks / content_stats["pages_with_content"]
             else:
                 content_stats["avg_blocks_per_page"] = 0
+            content_stats["content_types"] = dict(content_stats["content_types"])
             
             analytics_data = {
                 "type": "content",
@@ -842,7 +880,7 @@ async def get_analytics(request: AnalyticsRequest):
             }
             
         elif request.type == "activity":
-            pages = notion_server.notion.search(filter={"property": "object", "value": "page"})
+            pages = await notion_server.notion.search(filter={"property": "object", "value": "page"})
             
             now = datetime.now(timezone.utc)
             activity_buckets = {
@@ -852,10 +890,14 @@ async def get_analytics(request: AnalyticsRequest):
                 "older": []
             }
             
+            # Bucket boundaries, computed once: edited < 1, <= 7 and <= 30 whole days ago
+            today_cutoff = now - timedelta(days=1)
+            week_cutoff = now - timedelta(days=8)
+            month_cutoff = now - timedelta(days=31)
+            
             for page in pages.get("results", []):
                 try:
-                    last_edited = datetime.fromisoformat(page["last_edited_time"].replace("Z", "+00:00"))
-                    days_ago = (now - last_edited).days
+                    last_edited = NotionUtils.parse_timestamp(page["last_edited_time"])
                     
                     page_info = {
                         "title": NotionUtils.extract_title(page),
@@ -863,11 +905,11 @@ async def get_analytics(request: AnalyticsRequest):
                         "last_edited": page["last_edited_time"]
                     }
                     
-                    if days_ago == 0:
+                    if last_edited > today_cutoff:
                         activity_buckets["today"].append(page_info)
-                    elif days_ago <= 7:
+                    elif last_edited > week_cutoff:
                         activity_buckets["this_week"].append(page_info)
-                    elif days_ago <= 30:
+                    elif last_edited > month_cutoff:
                         activity_buckets["this_month"].append(page_info)
                     else:
                         activity_buckets["older"].append(page_info)
@@ -891,7 +933,7 @@ async def get_analytics(request: AnalyticsRequest):
             }
             
         elif request.type == "database":
-            databases = notion_server.notion.search(filter={"property": "object", "value": "database"})
+            databases = await notion_server.notion.search(filter={"property": "object", "value": "database"})
             
             database_stats = {
                 "total_databases": len(databases.get("results", [])),
@@ -966,7 +1008,7 @@ async def bulk_operations(request: BulkOperationRequest):
         
         if operation == "list":
             # Get pages with pagination to prevent timeouts
-            pages = notion_server.notion.search(
+            pages = await notion_server.notion.search(
                 filter={"property": "object", "value": "page"},
                 page_size=min(page_limit, 100)  # Notion API limit is 100
             )
@@ -987,7 +1029,7 @@ async def bulk_operations(request: BulkOperationRequest):
                 # Only get block count if explicitly requested (expensive operation)
                 if include_block_counts:
                     try:
-                        blocks = notion_server.notion.blocks.children.list(page["id"])
+                        blocks = await NotionUtils.list_block_children(notion_server.notion, page["id"])
                         page_data["block_count"] = len(blocks.get("results", []))
                     except:
                         page_data["block_count"] = 0
@@ -1016,7 +1058,7 @@ async def bulk_operations(request: BulkOperationRequest):
             
         elif operation == "analyze":
             # For analyze operation, limit to prevent timeouts
-            pages = notion_server.notion.search(
+            pages = await notion_server.notion.search(
                 filter={"property": "object", "value": "page"},
                 page_size=min(page_limit, 50)  # Even more conservative for analysis
             )
@@ -1041,15 +1083,12 @@ async def bulk_operations(request: BulkOperationRequest):
                 
                 # Get block count and types (but limit this expensive operation)
                 try:
-                    blocks = notion_server.notion.blocks.children.list(page["id"])
+                    blocks = await NotionUtils.list_block_children(notion_server.notion, page["id"])
                     page_data["block_count"] = len(blocks.get("results", []))
                     
                     # Analyze block types
-                    block_types = {}
-                    for block in blocks.get("results", []):
-                        block_type = block.get("type", "unknown")
-                        block_types[block_type] = block_types.get(block_type, 0) + 1
-                    page_data["block_types"] = block_types
+                    block_types = Counter(block.get("type", "unknown") for block in blocks.get("results", []))
+                    page_data["block_types"] = dict(block_types)
                     
                 except:
                     page_data["block_count"] = 0
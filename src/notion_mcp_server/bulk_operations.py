@@ -5,24 +5,29 @@ Handle bulk operations efficiently
 
 import os
 from typing import Any, Dict, List, Optional, Union
-from notion_client import Client
+from notion_client import AsyncClient
 from notion_client.errors import APIResponseError
 from .notion_utils import NotionUtils
 
+# Bulk requests in flight at once; the client's rate limiter paces the actual sends
+BULK_CONCURRENCY = 5
+
 
 class BulkOperations:
     """Bulk operations for Notion API"""
     
-    def __init__(self, notion_client: Client):
+    def __init__(self, notion_client: AsyncClient):
         self.notion = notion_client
     
-    async def handle_bulk_operations(self, user_input: str):
+    async def handle_bulk_operations(self, user_input: str, lowered: Optional[str] = None):
         """Handle bulk operations"""
+        if lowered is None:
+            lowered = user_input.lower()
         print("\n🔄 Bulk Operations")
         
-        if 'page' in user_input.lower():
+        if 'page' in lowered:
             await self.run_bulk_page_operations()
-        elif 'database' in user_input.lower():
+        elif 'database' in lowered:
             print("🗄️  Bulk database operations - Available soon")
         else:
             print("Available bulk operations:")
@@ -37,7 +42,7 @@ class BulkOperations:
         print("3. Search and analyze pages")
         
         try:
-            choice = input("\nSelect operation (1-3): ").strip()
+            choice = (await NotionUtils.ainput("\nSelect operation (1-3): ")).strip()
             
             if choice == "1":
                 await self.bulk_archive_pages()
@@ -53,12 +58,13 @@ class BulkOperations:
     
     async def bulk_archive_pages(self):
         """Archive multiple pages based on search criteria"""
-        query = input("Search query to find pages to archive: ").strip()
+        query = (await NotionUtils.ainput("Search query to find pages to archive: ")).strip()
         if not query:
             return
         
         try:
-            pages = self.notion.search(query=query, filter={"property": "object", "value": "page"})
+            # Always search fresh here: archiving must act on the pages as they are now
+            pages = await self.notion.search(query=query, filter={"property": "object", "value": "page"})
             found_pages = pages["results"]
             
             if not found_pages:
@@ -69,11 +75,22 @@ class BulkOperations:
             for i, page in enumerate(found_pages, 1):
                 print(f"{i}. {NotionUtils.extract_title(page)}")
             
-            confirm = input(f"\nArchive all {len(found_pages)} pages? (y/n): ").lower()
+            confirm = (await NotionUtils.ainput(f"\nArchive all {len(found_pages)} pages? (y/n): ")).lower()
             if confirm == 'y':
-                for page in found_pages:
+                results = await NotionUtils.gather_bounded([
                     self.notion.pages.update(page["id"], archived=True)
-                print(f"✅ Successfully archived {len(found_pages)} pages")
+                    for page in found_pages
+                ], limit=BULK_CONCURRENCY)
+                failures = [result for result in results if isinstance(result, Exception)]
+                archived_count = len(results) - len(failures)
+                
+                if archived_count:
+                    NotionUtils.invalidate_search_cache()
+                print(f"✅ Successfully archived {archived_count} pages")
+                if failures:
+                    print(f"❌ Failed to archive {len(failures)} pages")
+                    for error in failures[:3]:
+                        print(f"   • {error}")
             else:
                 print("Operation cancelled")
                 
@@ -83,54 +100,70 @@ class BulkOperations:
     async def bulk_list_pages(self):
         """List all pages with details"""
         try:
-            pages = self.notion.search(filter={"property": "object", "value": "page"})
+            # Every page in the workspace, not just the first search page
+            pages = await NotionUtils.search_all(
+                self.notion,
+                filter_obj={"property": "object", "value": "page"},
+                transform=NotionUtils.minimal_page
+            )
             
-            print(f"\n📋 All Pages ({len(pages['results'])} total):")
-            print("-" * 60)
+            lines = [
+                f"\n📋 All Pages ({len(pages)} total):",
+                "-" * 60
+            ]
             
-            for i, page in enumerate(pages["results"], 1):
-                title = NotionUtils.extract_title(page)
-                print(f"{i}. {title}")
-                print(f"   🆔 ID: {page['id']}")
-                print(f"   🔗 URL: {page['url']}")
-                print(f"   📅 Last edited: {page['last_edited_time']}")
-                print()
+            for i, page in enumerate(pages, 1):
+                lines.append(f"{i}. {page['title']}")
+                lines.append(f"   🆔 ID: {page['id']}")
+                lines.append(f"   🔗 URL: {page['url']}")
+                lines.append(f"   📅 Last edited: {page['last_edited_time']}")
+                lines.append("")
+            
+            NotionUtils.write_lines(lines)
             
         except Exception as e:
             print(f"❌ Error listing pages: {e}")
     
     async def bulk_analyze_pages(self):
         """Analyze pages by search criteria"""
-        query = input("Search query to analyze pages: ").strip()
+        query = (await NotionUtils.ainput("Search query to analyze pages: ")).strip()
         if not query:
             return
         
         try:
-            pages = self.notion.search(query=query, filter={"property": "object", "value": "page"})
+            pages = await self.notion.search(query=query, filter={"property": "object", "value": "page"})
             found_pages = pages["results"]
             
             if not found_pages:
                 print("No pages found matching your query.")
                 return
             
-            print(f"\n📊 Analysis of {len(found_pages)} pages matching '{query}':")
-            print("-" * 50)
+            # Fetch block lists for every matched page concurrently
+            block_results = await NotionUtils.gather_bounded([
+                NotionUtils.list_block_children(self.notion, page["id"])
+                for page in found_pages
+            ])
             
-            for i, page in enumerate(found_pages, 1):
+            lines = [
+                f"\n📊 Analysis of {len(found_pages)} pages matching '{query}':",
+                "-" * 50
+            ]
+            
+            for i, (page, blocks) in enumerate(zip(found_pages, block_results), 1):
                 title = NotionUtils.extract_title(page)
-                print(f"{i}. {title}")
-                print(f"   📅 Created: {page['created_time']}")
-                print(f"   ✏️  Last edited: {page['last_edited_time']}")
+                lines.append(f"{i}. {title}")
+                lines.append(f"   📅 Created: {page['created_time']}")
+                lines.append(f"   ✏️  Last edited: {page['last_edited_time']}")
                 
                 # Get content summary
-                try:
-                    blocks = self.notion.blocks.children.list(page["id"])
-                    block_count = len(blocks["results"])
-                    print(f"   📝 Blocks: {block_count}")
-                except:
-                    print(f"   📝 Blocks: Unable to retrieve")
+                if isinstance(blocks, Exception):
+                    lines.append(f"   📝 Blocks: Unable to retrieve")
+                else:
+                    lines.append(f"   📝 Blocks: {len(blocks['results'])}")
                 
-                print()
+                lines.append("")
+            
+            NotionUtils.write_lines(lines)
             
         except Exception as e:
             print(f"❌ Error analyzing pages: {e}")
@@ -142,37 +175,45 @@ class BulkOperations:
         created_pages = []
         failed_pages = []
         
-        for page_data in pages_data:
-            try:
-                # Get a suitable parent page
-                parent_id = await NotionUtils.get_suitable_parent(self.notion)
-                if not parent_id:
-                    failed_pages.append({"data": page_data, "error": "No suitable parent found"})
-                    continue
-                
-                # Create page with parent
-                page_payload = {
-                    "parent": {"page_id": parent_id},
-                    "properties": {"title": {"title": [{"text": {"content": page_data["title"]}}]}}
-                }
-                
-                # Add content if provided
-                if page_data.get("content"):
-                    page_payload["children"] = [{
-                        "object": "block",
-                        "type": "paragraph",
-                        "paragraph": {"rich_text": [{"text": {"content": page_data["content"]}}]}
-                    }]
-                
-                page = self.notion.pages.create(**page_payload)
+        # Get a suitable parent page, shared by the whole batch
+        parent_id = await NotionUtils.get_suitable_parent(self.notion)
+        
+        async def create_page(page_data: Dict[str, str]) -> dict:
+            if not parent_id:
+                raise ValueError("No suitable parent found")
+            
+            # Create page with parent
+            page_payload = {
+                "parent": {"page_id": parent_id},
+                "properties": {"title": {"title": [{"text": {"content": page_data["title"]}}]}}
+            }
+            
+            # Add content if provided
+            if page_data.get("content"):
+                page_payload["children"] = [{
+                    "object": "block",
+                    "type": "paragraph",
+                    "paragraph": {"rich_text": [{"text": {"content": page_data["content"]}}]}
+                }]
+            
+            return await self.notion.pages.create(**page_payload)
+        
+        results = await NotionUtils.gather_bounded(
+            [create_page(page_data) for page_data in pages_data], limit=BULK_CONCURRENCY
+        )
+        
+        for page_data, result in zip(pages_data, results):
+            if isinstance(result, Exception):
+                failed_pages.append({"data": page_data, "error": str(result)})
+            else:
                 created_pages.append({
                     "title": page_data["title"],
-                    "id": page["id"],
-                    "url": page["url"]
+                    "id": result["id"],
+                    "url": result["url"]
                 })
-                
-            except Exception as e:
-                failed_pages.append({"data": page_data, "error": str(e)})
+        
+        if created_pages:
+            NotionUtils.invalidate_search_cache()
         
         # Report results
         print(f"\n✅ Successfully created {len(created_pages)} pages")
@@ -188,20 +229,24 @@ class BulkOperations:
         updated_pages = []
         failed_updates = []
         
-        for update in updates:
-            try:
-                page_id = update["page_id"]
-                properties = update.get("properties", {})
-                
-                # Update page
-                updated_page = self.notion.pages.update(page_id, properties=properties)
+        async def update_page(update: Dict[str, Any]) -> dict:
+            return await self.notion.pages.update(update["page_id"], properties=update.get("properties", {}))
+        
+        results = await NotionUtils.gather_bounded(
+            [update_page(update) for update in updates], limit=BULK_CONCURRENCY
+        )
+        
+        for update, result in zip(updates, results):
+            if isinstance(result, Exception):
+                failed_updates.append({"update": update, "error": str(result)})
+            else:
                 updated_pages.append({
-                    "id": page_id,
-                    "title": NotionUtils.extract_title(updated_page)
+                    "id": update["page_id"],
+                    "title": NotionUtils.extract_title(result)
                 })
-                
-            except Exception as e:
-                failed_updates.append({"update": update, "error": str(e)})
+        
+        if updated_pages:
+            NotionUtils.invalidate_search_cache()
         
         # Report results
         print(f"\n✅ Successfully updated {len(updated_pages)} pages")
@@ -217,14 +262,19 @@ class BulkOperations:
         deleted_pages = []
         failed_deletions = []
         
-        for page_id in page_ids:
-            try:
-                # Archive page (Notion doesn't support true deletion)
-                self.notion.pages.update(page_id, archived=True)
+        # Archive pages (Notion doesn't support true deletion)
+        results = await NotionUtils.gather_bounded(
+            [self.notion.pages.update(page_id, archived=True) for page_id in page_ids], limit=BULK_CONCURRENCY
+        )
+        
+        for page_id, result in zip(page_ids, results):
+            if isinstance(result, Exception):
+                failed_deletions.append({"page_id": page_id, "error": str(result)})
+            else:
                 deleted_pages.append(page_id)
-                
-            except Exception as e:
-                failed_deletions.append({"page_id": page_id, "error": str(e)})
+        
+        if deleted_pages:
+            NotionUtils.invalidate_search_cache()
         
         # Report results
         print(f"\n✅ Successfully archived {len(deleted_pages)} pages")
@@ -240,26 +290,29 @@ class BulkOperations:
         exported_pages = []
         failed_exports = []
         
-        for page_id in page_ids:
-            try:
-                # Get page content
-                page = self.notion.pages.retrieve(page_id)
-                blocks = self.notion.blocks.children.list(page_id)
-                
-                # Extract page data
-                title = NotionUtils.extract_title(page)
-                content = await self._extract_page_content_for_export(blocks["results"])
-                
-                exported_pages.append({
-                    "id": page_id,
-                    "title": title,
-                    "content": content,
-                    "created_time": page["created_time"],
-                    "last_edited_time": page["last_edited_time"]
-                })
-                
-            except Exception as e:
-                failed_exports.append({"page_id": page_id, "error": str(e)})
+        async def export_page(page_id: str) -> dict:
+            # Get page content
+            page = await NotionUtils.retrieve_page(self.notion, page_id)
+            blocks = await NotionUtils.list_block_children(self.notion, page_id)
+            
+            # Extract page data
+            return {
+                "id": page_id,
+                "title": NotionUtils.extract_title(page),
+                "content": await self._extract_page_content_for_export(blocks["results"]),
+                "created_time": page["created_time"],
+                "last_edited_time": page["last_edited_time"]
+            }
+        
+        results = await NotionUtils.gather_bounded(
+            [export_page(page_id) for page_id in page_ids], limit=BULK_CONCURRENCY
+        )
+        
+        for page_id, result in zip(page_ids, results):
+            if isinstance(result, Exception):
+                failed_exports.append({"page_id": page_id, "error": str(result)})
+            else:
+                exported_pages.append(result)
         
         # Report results
         print(f"\n✅ Successfully exported {len(exported_pages)} pages")
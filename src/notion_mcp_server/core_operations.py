@@ -4,16 +4,20 @@ Basic CRUD operations for Notion API
 """
 
 import os
+import asyncio
 from typing import Any, Dict, List, Optional, Union
-from notion_client import Client
+from notion_client import AsyncClient
 from notion_client.errors import APIResponseError
 from .notion_utils import NotionUtils
 
+# Entries shown (and fetched) when reading a database
+DATABASE_PREVIEW_SIZE = 10
+
 
 class CoreOperations:
     """Core operations for Notion API"""
     
-    def __init__(self, notion_client: Client):
+    def __init__(self, notion_client: AsyncClient):
         self.notion = notion_client
     
     async def search_content(self, search_term: str):
@@ -22,35 +26,44 @@ class CoreOperations:
             print(f"\n🔍 Searching for: {search_term}")
             
             # Search all content
-            all_results = self.notion.search(query=search_term)
-            pages = [r for r in all_results.get("results", []) if r["object"] == "page"]
-            databases = [r for r in all_results.get("results", []) if r["object"] == "database"]
+            all_results = await self.notion.search(query=search_term)
+            pages = []
+            databases = []
+            for result in all_results.get("results", []):
+                if result["object"] == "page":
+                    pages.append(result)
+                elif result["object"] == "database":
+                    databases.append(result)
             
-            print(f"\n📊 Search Results:")
-            print(f"├── 📄 Pages: {len(pages)}")
-            print(f"└── 🗄️  Databases: {len(databases)}")
+            lines = [
+                f"\n📊 Search Results:",
+                f"├── 📄 Pages: {len(pages)}",
+                f"└── 🗄️  Databases: {len(databases)}"
+            ]
             
             if pages:
-                print(f"\n📄 Pages:")
+                lines.append(f"\n📄 Pages:")
                 for i, page in enumerate(pages[:10], 1):
                     title = NotionUtils.extract_title(page)
-                    print(f"  {i}. {title}")
-                    print(f"     🆔 {page['id']}")
-                    print(f"     🔗 {page['url']}")
-                    print(f"     📅 {page['last_edited_time']}")
-                    print()
+                    lines.append(f"  {i}. {title}")
+                    lines.append(f"     🆔 {page['id']}")
+                    lines.append(f"     🔗 {page['url']}")
+                    lines.append(f"     📅 {page['last_edited_time']}")
+                    lines.append("")
             
             if databases:
-                print(f"\n🗄️  Databases:")
+                lines.append(f"\n🗄️  Databases:")
                 for i, db in enumerate(databases[:5], 1):
                     title = NotionUtils.extract_database_title(db)
-                    print(f"  {i}. {title}")
-                    print(f"     🆔 {db['id']}")
-                    print(f"     🔗 {db['url']}")
-                    print()
+                    lines.append(f"  {i}. {title}")
+                    lines.append(f"     🆔 {db['id']}")
+                    lines.append(f"     🔗 {db['url']}")
+                    lines.append("")
             
             if not pages and not databases:
-                print(f"❌ No results found for '{search_term}'")
+                lines.append(f"❌ No results found for '{search_term}'")
+            
+            NotionUtils.write_lines(lines)
                 
         except Exception as e:
             print(f"❌ Search error: {e}")
@@ -60,14 +73,18 @@ class CoreOperations:
         try:
             print(f"\n📖 Reading page: {identifier}")
             
-            # Check if identifier is a page ID (UUID-like format)
-            if len(identifier) > 30 and '-' in identifier:
+            # Check if identifier is a page ID (32 hex digits, dashes optional)
+            if NotionUtils.is_valid_uuid(identifier):
                 # Direct page ID
                 page_id = identifier.replace('-', '')
-                page = self.notion.pages.retrieve(page_id)
+                # Header and content are independent, so fetch them together
+                page, blocks = await asyncio.gather(
+                    NotionUtils.retrieve_page(self.notion, page_id),
+                    NotionUtils.list_block_children(self.notion, page_id)
+                )
             else:
                 # Search for page by title
-                results = self.notion.search(
+                results = await self.notion.search(
                     query=identifier,
                     filter={"property": "object", "value": "page"}
                 )
@@ -78,17 +95,16 @@ class CoreOperations:
                 
                 # Find exact match or first result
                 page = None
+                identifier_lower = identifier.lower()
                 for result in results["results"]:
-                    title = NotionUtils.extract_title(result)
-                    if title.lower() == identifier.lower():
+                    if NotionUtils.extract_title(result).lower() == identifier_lower:
                         page = result
                         break
                 
                 if not page:
                     page = results["results"][0]  # Use first result
-                
-                page_id = page["id"]
-                page = self.notion.pages.retrieve(page_id)
+                # Search results are full page objects, no need to retrieve again
+                blocks = await NotionUtils.list_block_children(self.notion, page["id"])
             
             # Extract page info
             title = NotionUtils.extract_title(page)
@@ -96,22 +112,29 @@ class CoreOperations:
             last_edited = page["last_edited_time"]
             url = page["url"]
             
-            print(f"\n📄 Page: {title}")
-            print(f"🔗 URL: {url}")
-            print(f"📅 Created: {created_time}")
-            print(f"✏️ Last edited: {last_edited}")
-            print(f"🆔 ID: {page['id']}")
-            
-            # Get page content (blocks)
-            print(f"\n📝 Content:")
-            print("-" * 50)
-            
-            blocks = self.notion.blocks.children.list(page["id"])
+            lines = [
+                f"\n📄 Page: {title}",
+                f"🔗 URL: {url}",
+                f"📅 Created: {created_time}",
+                f"✏️ Last edited: {last_edited}",
+                f"🆔 ID: {page['id']}",
+                # Get page content (blocks)
+                f"\n📝 Content:",
+                "-" * 50
+            ]
             
             if not blocks.get("results"):
-                print("(This page has no content)")
+                lines.append("(This page has no content)")
             else:
-                await NotionUtils.display_page_blocks(blocks["results"])
+                lines.extend(await NotionUtils.render_page_blocks(blocks["results"], self.notion))
+            NotionUtils.write_lines(lines)
+            
+            # Long pages: show the rest one API page at a time as it arrives
+            if blocks.get("has_more"):
+                async for more_blocks in NotionUtils.iter_block_children(
+                    self.notion, page["id"], start_cursor=blocks["next_cursor"]
+                ):
+                    NotionUtils.write_lines(await NotionUtils.render_page_blocks(more_blocks, self.notion))
             
             print("-" * 50)
             
@@ -123,12 +146,12 @@ class CoreOperations:
         """Interactive page creation"""
         print("\n📝 Create New Page")
         
-        title = input("Page title: ").strip()
+        title = (await NotionUtils.ainput("Page title: ")).strip()
         if not title:
             print("❌ Title is required")
             return
         
-        content = input("Page content (optional): ").strip()
+        content = (await NotionUtils.ainput("Page content (optional): ")).strip()
         
         await self.create_page_direct(title, content)
     
@@ -155,7 +178,8 @@ class CoreOperations:
                     "paragraph": {"rich_text": [{"text": {"content": content}}]}
                 }]
             
-            page = self.notion.pages.create(**page_data)
+            page = await self.notion.pages.create(**page_data)
+            NotionUtils.invalidate_search_cache()
             print(f"✅ Page created successfully!")
             print(f"📄 Title: {title}")
             print(f"🔗 URL: {page['url']}")
@@ -172,7 +196,7 @@ class CoreOperations:
         print("• Page ID (e.g., 22750c4e-aa2a-81b4-8ff9-fb17b62f1db8)")
         print("• Page title (e.g., jaat)")
         
-        identifier = input("Enter page ID or title: ").strip()
+        identifier = (await NotionUtils.ainput("Enter page ID or title: ")).strip()
         if identifier:
             await self.read_page_content(identifier)
     
@@ -183,7 +207,7 @@ class CoreOperations:
         print("• All pages")
         print("• All databases")
         
-        choice = input("Enter choice (pages/databases): ").strip().lower()
+        choice = (await NotionUtils.ainput("Enter choice (pages/databases): ")).strip().lower()
         
         if choice == "pages":
             await self.list_all_pages()
@@ -195,18 +219,26 @@ class CoreOperations:
     async def list_all_pages(self):
         """List all pages with details"""
         try:
-            pages = self.notion.search(filter={"property": "object", "value": "page"})
+            # Every page in the workspace, not just the first search page
+            pages = await NotionUtils.search_all(
+                self.notion,
+                filter_obj={"property": "object", "value": "page"},
+                transform=NotionUtils.minimal_page
+            )
+            
+            lines = [
+                f"\n📋 All Pages ({len(pages)} total):",
+                "-" * 60
+            ]
             
-            print(f"\n📋 All Pages ({len(pages['results'])} total):")
-            print("-" * 60)
+            for i, page in enumerate(pages, 1):
+                lines.append(f"{i}. {page['title']}")
+                lines.append(f"   🆔 ID: {page['id']}")
+                lines.append(f"   🔗 URL: {page['url']}")
+                lines.append(f"   📅 Last edited: {page['last_edited_time']}")
+                lines.append("")
             
-            for i, page in enumerate(pages["results"], 1):
-                title = NotionUtils.extract_title(page)
-                print(f"{i}. {title}")
-                print(f"   🆔 ID: {page['id']}")
-                print(f"   🔗 URL: {page['url']}")
-                print(f"   📅 Last edited: {page['last_edited_time']}")
-                print()
+            NotionUtils.write_lines(lines)
             
         except Exception as e:
             print(f"❌ Error listing pages: {e}")
@@ -214,18 +246,22 @@ class CoreOperations:
     async def list_databases(self):
         """List all databases"""
         try:
-            databases = self.notion.search(filter={"property": "object", "value": "database"})
+            databases = await NotionUtils.search_all(self.notion, filter_obj={"property": "object", "value": "database"})
             
-            print(f"\n🗄️  All Databases ({len(databases['results'])} total):")
-            print("-" * 60)
+            lines = [
+                f"\n🗄️  All Databases ({len(databases)} total):",
+                "-" * 60
+            ]
             
-            for i, db in enumerate(databases["results"], 1):
+            for i, db in enumerate(databases, 1):
                 title = NotionUtils.extract_database_title(db)
-                print(f"{i}. {title}")
-                print(f"   🆔 ID: {db['id']}")
-                print(f"   🔗 URL: {db['url']}")
-                print(f"   📅 Last edited: {db['last_edited_time']}")
-                print()
+                lines.append(f"{i}. {title}")
+                lines.append(f"   🆔 ID: {db['id']}")
+                lines.append(f"   🔗 URL: {db['url']}")
+                lines.append(f"   📅 Last edited: {db['last_edited_time']}")
+                lines.append("")
+            
+            NotionUtils.write_lines(lines)
             
         except Exception as e:
             print(f"❌ Error listing databases: {e}")
@@ -242,31 +278,40 @@ class CoreOperations:
             print(f"\n🗄️ Reading database: {database_id}")
             
             # Get database info
-            database = self.notion.databases.retrieve(database_id)
+            database = await NotionUtils.retrieve_database(self.notion, database_id)
             title = database.get("title", [])
             db_title = title[0].get("text", {}).get("content", "Untitled") if title else "Untitled"
             
-            print(f"📊 Database: {db_title}")
-            print(f"🆔 ID: {database['id']}")
+            lines = [
+                f"📊 Database: {db_title}",
+                f"🆔 ID: {database['id']}"
+            ]
             
-            # Get database entries
-            entries = self.notion.databases.query(database_id=database_id)
+            # Get only the entries that are shown
+            entries = await self.notion.databases.query(database_id=database_id, page_size=DATABASE_PREVIEW_SIZE)
+            has_more = entries.get("has_more", False)
             
-            print(f"\n📋 Entries ({len(entries['results'])} total):")
-            print("-" * 50)
+            if has_more:
+                lines.append(f"\n📋 Entries (showing first {len(entries['results'])}):")
+            else:
+                lines.append(f"\n📋 Entries ({len(entries['results'])} total):")
+            lines.append("-" * 50)
             
-            for i, entry in enumerate(entries["results"][:10], 1):  # Show first 10 entries
+            for i, entry in enumerate(entries["results"], 1):
                 properties = NotionUtils.extract_properties(entry["properties"])
-                print(f"{i}. Entry {entry['id']}")
-                for prop_name, prop_value in properties.items():
-                    if prop_value:
-                        print(f"   {prop_name}: {prop_value}")
-                print()
+                lines.append(f"{i}. Entry {entry['id']}")
+                lines.extend(
+                    f"   {prop_name}: {prop_value}"
+                    for prop_name, prop_value in properties.items()
+                    if prop_value
+                )
+                lines.append("")
             
-            if len(entries["results"]) > 10:
-                print(f"... and {len(entries['results']) - 10} more entries")
+            if has_more:
+                lines.append("... more entries available")
             
-            print("-" * 50)
+            lines.append("-" * 50)
+            NotionUtils.write_lines(lines)
             
         except Exception as e:
             print(f"❌ Error reading database: {e}") 
\ No newline at end of file
@@ -5,13 +5,147 @@ Helper functions for parsing and formatting Notion API responses
 
 import os
 import re
-from typing import Any, Dict, List, Optional, Union
-from notion_client import Client
+import sys
+import asyncio
+import textwrap
+import threading
+from functools import partial
+from datetime import datetime
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Union
+from cachetools import LRUCache, TTLCache
+from notion_client import AsyncClient
+
+# Concurrent Notion requests allowed per fan-out (keeps us near Notion's rate limit)
+MAX_CONCURRENT_REQUESTS = 8
+
+try:
+    # C-accelerated ISO 8601 parser, when installed
+    from ciso8601 import parse_datetime as _parse_iso_datetime
+except ImportError:
+    if sys.version_info >= (3, 11):
+        # fromisoformat accepts Notion's trailing "Z" since Python 3.11
+        _parse_iso_datetime = datetime.fromisoformat
+    else:
+        def _parse_iso_datetime(value: str) -> datetime:
+            return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+# Nesting levels of child blocks fetched when displaying a page
+MAX_BLOCK_DEPTH = 3
+
+# Largest page_size Notion accepts for paginated endpoints
+NOTION_MAX_PAGE_SIZE = 100
+
+# Seconds a Notion search response is reused before hitting the API again
+SEARCH_CACHE_TTL = 60
+
+# Shared by all operation classes so repeated searches within a session are free
+_search_cache = TTLCache(maxsize=256, ttl=SEARCH_CACHE_TTL)
+
+# search_all scans still paginating, per cache key, so concurrent callers share one scan
+_running_scans: Dict[tuple, "asyncio.Task[List[dict]]"] = {}
+
+# Seconds a retrieved page or database object is reused
+OBJECT_CACHE_TTL = 30
+
+# pages.retrieve / databases.retrieve results per (token, kind, id without dashes)
+_object_cache = TTLCache(maxsize=512, ttl=OBJECT_CACHE_TTL)
+
+# Extracted page titles per (page id, last_edited_time); an edit changes the key
+_title_cache = LRUCache(maxsize=4096)
+
+# Shared read-only default for missing nested objects, so lookups on a miss don't allocate a dict
+_EMPTY: Dict[str, Any] = {}
+
+# Property names Notion uses for the title of pages and database rows
+_COMMON_TITLE_PROPERTIES = ("title", "Name")
+
+# Title property name per parent database ID; every row of a database shares its schema
+_title_property_names: Dict[str, str] = {}
+
+# A Notion page ID anywhere in user input, dashed or not (also matches IDs inside page URLs)
+_UUID_RE = re.compile(
+    r"(?<![0-9a-f])[0-9a-f]{8}-?[0-9a-f]{4}-?[0-9a-f]{4}-?[0-9a-f]{4}-?[0-9a-f]{12}(?![0-9a-f])",
+    re.IGNORECASE
+)
+
+# Command words stripped from "read page ..." style requests
+_COMMAND_WORDS_RE = re.compile(r"\b(?:read|get|show|view|page|content|of)\b")
+
+# Resolved parent page ID per (token, NOTION_DEFAULT_PARENT_ID)
+_parent_cache: Dict[tuple, str] = {}
+
+
+def _finish_scan(key: tuple, scan: "asyncio.Task[List[dict]]"):
+    """Cache a finished search_all scan unless the cache was invalidated while it ran"""
+    if _running_scans.get(key) is not scan:
+        if not scan.cancelled():
+            scan.exception()  # Retrieved, so a failed orphan scan doesn't log a warning
+        return
+    del _running_scans[key]
+    if not scan.cancelled() and scan.exception() is None:
+        _search_cache[key] = scan.result()
 
 
 class NotionUtils:
     """Utility class for Notion API operations"""
     
+    # Parse a Notion timestamp such as "2024-05-01T12:30:00.000Z" into an aware datetime
+    parse_timestamp = staticmethod(_parse_iso_datetime)
+    
+    @staticmethod
+    async def gather_bounded(coros: List[Any], limit: int = MAX_CONCURRENT_REQUESTS) -> List[Any]:
+        """
+        Await coroutines concurrently with at most `limit` in flight.
+        
+        Exceptions are returned in place of results so one failed request
+        does not cancel the rest of the batch.
+        """
+        semaphore = asyncio.Semaphore(limit)
+        
+        async def run(coro):
+            async with semaphore:
+                return await coro
+        
+        return await asyncio.gather(*(run(coro) for coro in coros), return_exceptions=True)
+    
+    @staticmethod
+    async def ainput(prompt: str = "") -> str:
+        """
+        Read a line from stdin without blocking the event loop.
+        
+        input() runs on a daemon thread so a pending prompt never keeps the
+        process alive at exit; EOFError and friends are re-raised here.
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        
+        def settle(result: Optional[str], error: Optional[BaseException]):
+            if future.done():
+                return
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+        
+        def read_line():
+            try:
+                line = input(prompt)
+            except BaseException as error:
+                loop.call_soon_threadsafe(settle, None, error)
+            else:
+                loop.call_soon_threadsafe(settle, line, None)
+        
+        threading.Thread(target=read_line, daemon=True).start()
+        return await future
+    
+    @staticmethod
+    def write_lines(lines: List[str]):
+        """Print a block of output lines with a single write to stdout"""
+        if not lines:
+            return
+        sys.stdout.write("\n".join(lines) + "\n")
+        sys.stdout.flush()
+    
     @staticmethod
     def is_valid_uuid(uuid_string: str) -> bool:
         """Check if a string is a valid UUID format"""
@@ -34,85 +168,79 @@ class NotionUtils:
     @staticmethod
     def extract_block_text(block: dict) -> str:
         """Extract text content from a block"""
-        block_type = block.get("type", "")
-        
-        if block_type == "paragraph":
-            return NotionUtils.extract_rich_text(block["paragraph"]["rich_text"])
-        elif block_type == "heading_1":
-            return NotionUtils.extract_rich_text(block["heading_1"]["rich_text"])
-        elif block_type == "heading_2":
-            return NotionUtils.extract_rich_text(block["heading_2"]["rich_text"])
-        elif block_type == "heading_3":
-            return NotionUtils.extract_rich_text(block["heading_3"]["rich_text"])
-        elif block_type == "bulleted_list_item":
-            return NotionUtils.extract_rich_text(block["bulleted_list_item"]["rich_text"])
-        elif block_type == "numbered_list_item":
-            return NotionUtils.extract_rich_text(block["numbered_list_item"]["rich_text"])
-        elif block_type == "to_do":
-            return NotionUtils.extract_rich_text(block["to_do"]["rich_text"])
-        elif block_type == "quote":
-            return NotionUtils.extract_rich_text(block["quote"]["rich_text"])
-        elif block_type == "callout":
-            return NotionUtils.extract_rich_text(block["callout"]["rich_text"])
-        elif block_type == "code":
-            return NotionUtils.extract_rich_text(block["code"]["rich_text"])
-        elif block_type == "divider":
-            return "---"
-        elif block_type == "image":
-            image_info = block["image"]
-            if image_info.get("type") == "external":
-                return f"Image: {image_info['external']['url']}"
-            elif image_info.get("type") == "file":
-                return f"Image: {image_info['file']['url']}"
-            else:
-                return "Image (embedded)"
-        elif block_type == "embed":
-            return f"Embed: {block['embed']['url']}"
-        elif block_type == "bookmark":
-            return f"Bookmark: {block['bookmark']['url']}"
-        else:
-            return f"[{block_type.upper()}] content"
+        extract = _BLOCK_TEXT_EXTRACTORS.get(block.get("type", ""), _unknown_block_text)
+        return extract(block)
     
     @staticmethod
     def extract_page_identifier(user_input: str) -> Optional[str]:
         """Extract page identifier (name or ID) from user input"""
-        # Remove command words
-        text = user_input.lower()
-        for word in ['read', 'get', 'show', 'view', 'page', 'content', 'of']:
-            text = text.replace(word, '')
+        # A page ID needs no further cleanup
+        uuid_match = _UUID_RE.search(user_input)
+        if uuid_match:
+            return uuid_match.group(0)
+        
+        # Remove command words in one pass (whole words only, so "often" stays intact)
+        text = _COMMAND_WORDS_RE.sub('', user_input.lower())
         
         # Clean up and extract identifier
-        identifier = text.strip()
+        identifier = " ".join(text.split())
         if identifier:
             return identifier
         return None
     
     @staticmethod
     def extract_title(page: dict) -> str:
-        """Extract title from page"""
-        properties = page.get("properties", {})
-        for prop_name, prop_value in properties.items():
-            if prop_value.get("type") == "title":
-                title_list = prop_value.get("title", [])
-                if title_list:
-                    return title_list[0].get("text", {}).get("content", "Untitled")
-        return "Untitled"
+        """Extract title from page, cached per (id, last_edited_time)"""
+        key = (page.get("id"), page.get("last_edited_time", ""))
+        title = _title_cache.get(key)
+        if title is not None:
+            return title
+        
+        properties = page.get("properties", _EMPTY)
+        
+        # Pages use "title" and database rows usually "Name"; check those before scanning
+        title_prop = next(
+            (properties[name] for name in _COMMON_TITLE_PROPERTIES
+             if properties.get(name, _EMPTY).get("type") == "title"),
+            None
+        )
+        if title_prop is None:
+            # Rows of a database seen before: go straight to its title property
+            database_id = page.get("parent", _EMPTY).get("database_id")
+            title_name = _title_property_names.get(database_id)
+            if title_name is not None and properties.get(title_name, _EMPTY).get("type") == "title":
+                title_prop = properties[title_name]
+            else:
+                title_name = next((name for name, prop in properties.items() if prop.get("type") == "title"), None)
+                title_prop = properties[title_name] if title_name is not None else _EMPTY
+                if database_id is not None and title_name is not None:
+                    _title_property_names[database_id] = title_name
+        
+        title_list = title_prop.get("title", [])
+        title = title_list[0].get("text", _EMPTY).get("content", "Untitled") if title_list else "Untitled"
+        
+        if key[0] is not None:
+            _title_cache[key] = title
+        return title
     
     @staticmethod
     def extract_database_title(database: dict) -> str:
         """Extract title from database"""
         title = database.get("title", [])
         if title:
-            return title[0].get("text", {}).get("content", "Untitled")
+            return title[0].get("text", _EMPTY).get("content", "Untitled")
         return "Untitled"
     
     @staticmethod
     def extract_rich_text(rich_text: List[dict]) -> str:
         """Extract plain text from rich text array"""
-        return "".join([
-            item.get("text", {}).get("content", "")
+        # Most rich text is a single unformatted run; skip the generator and join
+        if len(rich_text) == 1:
+            return (rich_text[0].get("text") or _EMPTY).get("content", "")
+        return "".join(
+            (item.get("text") or _EMPTY).get("content", "")
             for item in rich_text
-        ])
+        )
     
     @staticmethod
     def extract_properties(properties: dict) -> dict:
@@ -120,115 +248,55 @@ class NotionUtils:
         extracted = {}
         
         for prop_name, prop_value in properties.items():
-            prop_type = prop_value.get("type", "")
-            
-            if prop_type == "title":
-                extracted[prop_name] = NotionUtils.extract_rich_text(prop_value["title"])
-            elif prop_type == "rich_text":
-                extracted[prop_name] = NotionUtils.extract_rich_text(prop_value["rich_text"])
-            elif prop_type == "select":
-                select_value = prop_value.get("select")
-                extracted[prop_name] = select_value["name"] if select_value else None
-            elif prop_type == "multi_select":
-                multi_select = prop_value.get("multi_select", [])
-                extracted[prop_name] = [item["name"] for item in multi_select]
-            elif prop_type == "date":
-                date_value = prop_value.get("date")
-                extracted[prop_name] = date_value["start"] if date_value else None
-            elif prop_type == "number":
-                extracted[prop_name] = prop_value.get("number")
-            elif prop_type == "checkbox":
-                extracted[prop_name] = prop_value.get("checkbox")
-            elif prop_type == "url":
-                extracted[prop_name] = prop_value.get("url")
-            elif prop_type == "email":
-                extracted[prop_name] = prop_value.get("email")
-            elif prop_type == "phone_number":
-                extracted[prop_name] = prop_value.get("phone_number")
-            else:
-                extracted[prop_name] = str(prop_value)
+            extract = _PROPERTY_EXTRACTORS.get(prop_value.get("type", ""))
+            extracted[prop_name] = extract(prop_value) if extract else str(prop_value)
         
         return extracted
     
     @staticmethod
-    async def display_page_blocks(blocks: List[dict]):
-        """Display page blocks in a readable format"""
-        for block in blocks:
-            block_type = block.get("type", "")
-            block_id = block.get("id", "")
-            
-            if block_type == "paragraph":
-                text = NotionUtils.extract_rich_text(block["paragraph"]["rich_text"])
-                if text:
-                    print(f"{text}")
-                else:
-                    print("(empty paragraph)")
-            
-            elif block_type == "heading_1":
-                text = NotionUtils.extract_rich_text(block["heading_1"]["rich_text"])
-                print(f"\n# {text}")
-            
-            elif block_type == "heading_2":
-                text = NotionUtils.extract_rich_text(block["heading_2"]["rich_text"])
-                print(f"\n## {text}")
-            
-            elif block_type == "heading_3":
-                text = NotionUtils.extract_rich_text(block["heading_3"]["rich_text"])
-                print(f"\n### {text}")
-            
-            elif block_type == "bulleted_list_item":
-                text = NotionUtils.extract_rich_text(block["bulleted_list_item"]["rich_text"])
-                print(f"• {text}")
-            
-            elif block_type == "numbered_list_item":
-                text = NotionUtils.extract_rich_text(block["numbered_list_item"]["rich_text"])
-                print(f"1. {text}")
-            
-            elif block_type == "code":
-                language = block["code"].get("language", "")
-                text = NotionUtils.extract_rich_text(block["code"]["rich_text"])
-                print(f"\n```{language}")
-                print(text)
-                print("```")
-            
-            elif block_type == "quote":
-                text = NotionUtils.extract_rich_text(block["quote"]["rich_text"])
-                print(f"\n> {text}")
-            
-            elif block_type == "divider":
-                print("\n---")
-            
-            elif block_type == "image":
-                image_info = block["image"]
-                if image_info.get("type") == "external":
-                    print(f"\n🖼️ Image: {image_info['external']['url']}")
-                elif image_info.get("type") == "file":
-                    print(f"\n🖼️ Image: {image_info['file']['url']}")
-                else:
-                    print("\n🖼️ Image (embedded)")
-            
-            elif block_type == "embed":
-                embed_url = block["embed"]["url"]
-                print(f"\n🔗 Embed: {embed_url}")
-            
-            elif block_type == "bookmark":
-                bookmark_url = block["bookmark"]["url"]
-                print(f"\n🔖 Bookmark: {bookmark_url}")
-            
-            elif block_type == "table":
-                print(f"\n📊 Table ({block_id})")
-                # Note: Table content requires additional API calls
-            
-            elif block_type == "column_list":
-                print(f"\n📑 Column Layout")
-                # Note: Column content requires additional API calls
+    async def display_page_blocks(blocks: List[dict], notion_client: Optional[AsyncClient] = None):
+        """Display page blocks in a readable format (see render_page_blocks)"""
+        NotionUtils.write_lines(await NotionUtils.render_page_blocks(blocks, notion_client))
+    
+    @staticmethod
+    async def render_page_blocks(blocks: List[dict], notion_client: Optional[AsyncClient] = None) -> List[str]:
+        """
+        Render page blocks as display lines.
+        
+        Given a client, nested blocks are fetched and shown indented under
+        their parent, up to MAX_BLOCK_DEPTH levels (see fetch_block_children).
+        """
+        children = await NotionUtils.fetch_block_children(notion_client, blocks) if notion_client else {}
+        return _render_block_lines(blocks, children, 0)
+    
+    @staticmethod
+    async def fetch_block_children(notion_client: AsyncClient, blocks: List[dict],
+                                   max_depth: int = MAX_BLOCK_DEPTH) -> Dict[str, List[dict]]:
+        """
+        Fetch nested blocks breadth-first, one concurrent round per depth level.
+        
+        Returns the child blocks of every fetched parent, keyed by parent block ID.
+        Parents whose children could not be fetched are left out.
+        """
+        children = {}
+        level = blocks
+        for _ in range(max_depth):
+            parent_ids = [block["id"] for block in level if block.get("has_children")]
+            if not parent_ids:
+                break
             
-            else:
-                print(f"\n[{block_type.upper()}] (Block ID: {block_id})")
+            responses = await NotionUtils.gather_bounded([
+                NotionUtils.list_block_children(notion_client, parent_id) for parent_id in parent_ids
+            ])
             
-            # Check if block has children
-            if block.get("has_children"):
-                print(f"   └── (Has child blocks)")
+            level = []
+            for parent_id, response in zip(parent_ids, responses):
+                if isinstance(response, Exception):
+                    continue
+                children[parent_id] = response["results"]
+                level.extend(response["results"])
+        
+        return children
     
     @staticmethod
     def split_long_content(content: str, max_length: int = 2000) -> list:
@@ -284,101 +352,377 @@ class NotionUtils:
         return [chunk for chunk in chunks if chunk]  # Remove empty chunks
     
     @staticmethod
-    def get_suitable_parent_sync(notion_client: Client) -> Optional[str]:
-        """Get a suitable parent page ID (synchronous version)"""
-        try:
-            # Strategy 1: Environment variable
-            env_parent = os.getenv("NOTION_DEFAULT_PARENT_ID")
-            if env_parent:
-                try:
-                    notion_client.pages.retrieve(env_parent)
-                    return env_parent
-                except:
-                    pass
-            
-            # Strategy 2: Search for common parent page names
-            parent_names = ["AI Agent Journey", "Notes", "Projects", "MCP Pages"]
-            
-            for name in parent_names:
-                try:
-                    results = notion_client.search(
-                        query=name,
-                        filter={"property": "object", "value": "page"}
-                    )
-                    
-                    for page in results.get("results", []):
-                        page_title = NotionUtils.extract_title(page)
-                        if name.lower() in page_title.lower():
-                            print(f"✅ Using parent: {page_title}")
-                            return page["id"]
-                except:
-                    continue
+    async def cached_search(notion_client: AsyncClient, query: str = "", filter_obj: Optional[dict] = None, **kwargs) -> dict:
+        """
+        Search Notion, reusing responses for identical searches made within SEARCH_CACHE_TTL.
+        
+        Callers must treat the returned response as read-only since it is shared.
+        """
+        key = (notion_client.options.auth, query, repr(filter_obj), repr(sorted(kwargs.items())))
+        response = _search_cache.get(key)
+        if response is None:
+            if filter_obj is not None:
+                kwargs["filter"] = filter_obj
+            response = await notion_client.search(query=query, **kwargs)
+            _search_cache[key] = response
+        return response
+    
+    @staticmethod
+    def minimal_page(page: dict) -> dict:
+        """Reduce a page object to the fields the reports use, extracting the title once"""
+        return {
+            "id": page["id"],
+            "title": NotionUtils.extract_title(page),
+            "url": page.get("url", ""),
+            "created_time": page.get("created_time", ""),
+            "last_edited_time": page.get("last_edited_time", ""),
+            "archived": page.get("archived", False)
+        }
+    
+    @staticmethod
+    async def search_all(notion_client: AsyncClient, filter_obj: Optional[dict] = None, query: str = "",
+                   transform: Optional[Callable[[dict], dict]] = None) -> List[dict]:
+        """
+        Return every search result, following Notion's cursor pagination.
+        
+        If given, `transform` is applied to each result as its page of results
+        arrives, so only the reduced objects are kept. The full result list is
+        cached like cached_search responses, and a caller asking while the same
+        scan is still running (e.g. the background prefetch) waits for it
+        instead of starting another.
+        """
+        transform_name = getattr(transform, "__qualname__", None)
+        key = (notion_client.options.auth, "all", query, repr(filter_obj), transform_name)
+        results = _search_cache.get(key)
+        if results is not None:
+            return results
+        
+        scan = _running_scans.get(key)
+        if scan is None:
+            scan = asyncio.create_task(NotionUtils._collect_search(notion_client, filter_obj, query, transform))
+            _running_scans[key] = scan
+            scan.add_done_callback(partial(_finish_scan, key))
+        # Shielded so one caller giving up (e.g. a cancelled prefetch) doesn't cancel the scan for the others
+        return await asyncio.shield(scan)
+    
+    @staticmethod
+    async def _collect_search(notion_client: AsyncClient, filter_obj: Optional[dict], query: str,
+                              transform: Optional[Callable[[dict], dict]]) -> List[dict]:
+        """Every search result as a list, transformed as it arrives"""
+        return [
+            transform(result) if transform else result
+            async for result in NotionUtils.iter_search(notion_client, filter_obj=filter_obj, query=query)
+        ]
+    
+    @staticmethod
+    def cancel_running_scans():
+        """Stop every search_all scan still paginating, e.g. before its client is closed"""
+        for scan in list(_running_scans.values()):
+            scan.cancel()
+        _running_scans.clear()
+    
+    @staticmethod
+    async def iter_search(notion_client: AsyncClient, filter_obj: Optional[dict] = None,
+                          query: str = "") -> AsyncIterator[dict]:
+        """
+        Yield every search result, following Notion's cursor pagination.
+        
+        The next page is requested before the current one is yielded, so the
+        network round-trip overlaps with the caller's processing.
+        """
+        search_args = {"query": query, "page_size": NOTION_MAX_PAGE_SIZE}
+        if filter_obj is not None:
+            search_args["filter"] = filter_obj
+        
+        response = await notion_client.search(**search_args)
+        while True:
+            next_page = None
+            if response.get("has_more"):
+                next_page = asyncio.create_task(
+                    notion_client.search(**search_args, start_cursor=response["next_cursor"])
+                )
+                # Let the request go out before handing over this page
+                await asyncio.sleep(0)
             
-            # Strategy 3: Use any available page as parent
-            results = notion_client.search(
-                query="",
-                filter={"property": "object", "value": "page"},
-                page_size=5
-            )
+            try:
+                for result in response.get("results", []):
+                    yield result
+            except BaseException:
+                # Caller stopped early; don't leave the prefetch running
+                if next_page is not None:
+                    next_page.cancel()
+                raise
             
-            if results.get("results"):
-                first_page = results["results"][0]
-                page_title = NotionUtils.extract_title(first_page)
-                print(f"⚠️ Using first available page as parent: {page_title}")
-                return first_page["id"]
+            if next_page is None:
+                break
+            response = await next_page
+    
+    @staticmethod
+    async def iter_block_children(notion_client: AsyncClient, block_id: str,
+                                  start_cursor: Optional[str] = None) -> AsyncIterator[List[dict]]:
+        """
+        Yield a block's children one API page at a time, following cursor pagination.
+        
+        Like iter_search, the next page is requested before the current one is
+        yielded, so callers can display blocks while the rest are fetched.
+        """
+        list_args = {"block_id": block_id, "page_size": NOTION_MAX_PAGE_SIZE}
+        
+        response = await notion_client.blocks.children.list(**list_args, start_cursor=start_cursor)
+        while True:
+            next_page = None
+            if response.get("has_more"):
+                next_page = asyncio.create_task(
+                    notion_client.blocks.children.list(**list_args, start_cursor=response["next_cursor"])
+                )
+                # Let the request go out before handing over this page
+                await asyncio.sleep(0)
             
-            return None
+            try:
+                yield response.get("results", [])
+            except BaseException:
+                # Caller stopped early; don't leave the prefetch running
+                if next_page is not None:
+                    next_page.cancel()
+                raise
             
-        except Exception as e:
-            print(f"❌ Error finding parent: {e}")
-            return None
+            if next_page is None:
+                break
+            response = await next_page
+    
+    @staticmethod
+    async def retrieve_page(notion_client: AsyncClient, page_id: str) -> dict:
+        """pages.retrieve, reusing the result for OBJECT_CACHE_TTL seconds"""
+        key = (notion_client.options.auth, "page", page_id.replace("-", ""))
+        page = _object_cache.get(key)
+        if page is None:
+            page = await notion_client.pages.retrieve(page_id)
+            _object_cache[key] = page
+        return page
+    
+    @staticmethod
+    async def retrieve_database(notion_client: AsyncClient, database_id: str) -> dict:
+        """databases.retrieve, reusing the result for OBJECT_CACHE_TTL seconds"""
+        key = (notion_client.options.auth, "database", database_id.replace("-", ""))
+        database = _object_cache.get(key)
+        if database is None:
+            database = await notion_client.databases.retrieve(database_id)
+            _object_cache[key] = database
+        return database
     
     @staticmethod
-    async def get_suitable_parent(notion_client: Client) -> Optional[str]:
+    async def list_block_children(notion_client: AsyncClient, block_id: str) -> dict:
+        """blocks.children.list, reusing the first page of children for OBJECT_CACHE_TTL seconds"""
+        key = (notion_client.options.auth, "children", block_id.replace("-", ""))
+        children = _object_cache.get(key)
+        if children is None:
+            children = await notion_client.blocks.children.list(block_id)
+            _object_cache[key] = children
+        return children
+    
+    @staticmethod
+    def invalidate_search_cache():
+        """Drop cached search results, retrieved objects and block listings after the workspace has been modified"""
+        _search_cache.clear()
+        _object_cache.clear()
+        # Scans already under way may have missed the change; later callers start fresh ones
+        _running_scans.clear()
+    
+    @staticmethod
+    async def get_suitable_parent(notion_client: AsyncClient) -> Optional[str]:
         """Get a suitable parent page ID"""
         try:
-            # Strategy 1: Environment variable
             env_parent = os.getenv("NOTION_DEFAULT_PARENT_ID")
+            
+            # The resolved parent only depends on the token and NOTION_DEFAULT_PARENT_ID
+            cache_key = (notion_client.options.auth, env_parent)
+            if cache_key in _parent_cache:
+                return _parent_cache[cache_key]
+            
+            # Strategy 1: Environment variable, trusted as configured; a bad ID
+            # surfaces from the create call instead of costing a probe request
             if env_parent:
-                try:
-                    notion_client.pages.retrieve(env_parent)
-                    return env_parent
-                except:
-                    pass
+                _parent_cache[cache_key] = env_parent
+                return env_parent
+            
+            # Strategy 2: Look for common parent page names in one listing of pages
+            results = await NotionUtils.cached_search(
+                notion_client,
+                query="",
+                filter_obj={"property": "object", "value": "page"},
+                page_size=NOTION_MAX_PAGE_SIZE
+            )
+            pages = results.get("results", [])
             
-            # Strategy 2: Search for common parent page names
             parent_names = ["AI Agent Journey", "Notes", "Projects", "MCP Pages"]
+            parent = _find_named_page(pages, parent_names)
             
-            for name in parent_names:
-                try:
-                    results = notion_client.search(
+            # The listing only covers the first pages of a large workspace; if no
+            # name matched there, search for the names directly, all at once
+            if parent is None and results.get("has_more"):
+                name_results = await NotionUtils.gather_bounded([
+                    NotionUtils.cached_search(
+                        notion_client,
                         query=name,
-                        filter={"property": "object", "value": "page"}
+                        filter_obj={"property": "object", "value": "page"}
                     )
-                    
-                    for page in results.get("results", []):
-                        page_title = NotionUtils.extract_title(page)
-                        if name.lower() in page_title.lower():
-                            print(f"✅ Using parent: {page_title}")
-                            return page["id"]
-                except:
-                    continue
+                    for name in parent_names
+                ])
+                parent = _find_named_page(
+                    [page for named in name_results if not isinstance(named, Exception)
+                     for page in named.get("results", [])],
+                    parent_names
+                )
             
-            # Strategy 3: Use any available page as parent
-            results = notion_client.search(
-                query="",
-                filter={"property": "object", "value": "page"},
-                page_size=5
-            )
+            if parent is not None:
+                print(f"✅ Using parent: {NotionUtils.extract_title(parent)}")
+                _parent_cache[cache_key] = parent["id"]
+                return parent["id"]
             
-            if results.get("results"):
-                first_page = results["results"][0]
+            # Strategy 3: Use any available page as parent
+            if pages:
+                first_page = pages[0]
                 page_title = NotionUtils.extract_title(first_page)
                 print(f"⚠️ Using first available page as parent: {page_title}")
+                _parent_cache[cache_key] = first_page["id"]
                 return first_page["id"]
             
             return None
             
         except Exception as e:
             print(f"❌ Error finding parent: {e}")
-            return None
\ No newline at end of file
+            return None
+
+
+def _find_named_page(pages: List[dict], names: List[str]) -> Optional[dict]:
+    """First page whose title contains the earliest possible of `names` (names are in preference order)"""
+    names_lower = [name.lower() for name in names]
+    best_page, best_rank = None, len(names_lower)
+    
+    # One pass over the pages, lowercasing each title once
+    for page in pages:
+        title_lower = NotionUtils.extract_title(page).lower()
+        rank = next((rank for rank, name in enumerate(names_lower[:best_rank]) if name in title_lower), None)
+        if rank is not None:
+            best_page, best_rank = page, rank
+            if rank == 0:
+                break
+    
+    return best_page
+
+
+def _render_block_lines(blocks: List[dict], children: Dict[str, List[dict]], depth: int) -> List[str]:
+    """Display lines for blocks, with prefetched children indented under their parent"""
+    indent = "    " * depth
+    lines = []
+    
+    for block in blocks:
+        render = _BLOCK_RENDERERS.get(block.get("type", ""), _render_unknown_block)
+        text = render(block)
+        lines.append(textwrap.indent(text, indent) if indent else text)
+        
+        # Check if block has children
+        if block.get("has_children"):
+            block_children = children.get(block.get("id", ""))
+            if block_children is not None:
+                lines.extend(_render_block_lines(block_children, children, depth + 1))
+            else:
+                lines.append(f"{indent}   └── (Has child blocks)")
+    
+    return lines
+
+
+# Block renderers for display_page_blocks: each returns the display text for one block
+def _block_text(block: dict) -> str:
+    return NotionUtils.extract_rich_text(block[block["type"]]["rich_text"])
+
+
+def _prefixed_text_renderer(prefix: str) -> Callable[[dict], str]:
+    return lambda block: f"{prefix}{_block_text(block)}"
+
+
+def _render_paragraph(block: dict) -> str:
+    return _block_text(block) or "(empty paragraph)"
+
+
+def _render_code(block: dict) -> str:
+    language = block["code"].get("language", "")
+    return f"\n```{language}\n{_block_text(block)}\n```"
+
+
+def _render_image(block: dict) -> str:
+    image_info = block["image"]
+    if image_info.get("type") == "external":
+        return f"\n🖼️ Image: {image_info['external']['url']}"
+    elif image_info.get("type") == "file":
+        return f"\n🖼️ Image: {image_info['file']['url']}"
+    return "\n🖼️ Image (embedded)"
+
+
+def _render_unknown_block(block: dict) -> str:
+    return f"\n[{block.get('type', '').upper()}] (Block ID: {block.get('id', '')})"
+
+
+_BLOCK_RENDERERS: Dict[str, Callable[[dict], str]] = {
+    "paragraph": _render_paragraph,
+    "heading_1": _prefixed_text_renderer("\n# "),
+    "heading_2": _prefixed_text_renderer("\n## "),
+    "heading_3": _prefixed_text_renderer("\n### "),
+    "bulleted_list_item": _prefixed_text_renderer("• "),
+    "numbered_list_item": _prefixed_text_renderer("1. "),
+    "code": _render_code,
+    "quote": _prefixed_text_renderer("\n> "),
+    "divider": lambda block: "\n---",
+    "image": _render_image,
+    "embed": lambda block: f"\n🔗 Embed: {block['embed']['url']}",
+    "bookmark": lambda block: f"\n🔖 Bookmark: {block['bookmark']['url']}",
+    # Table and column content require additional API calls
+    "table": lambda block: f"\n📊 Table ({block.get('id', '')})",
+    "column_list": lambda block: "\n📑 Column Layout",
+}
+
+
+# Plain-text extractors for extract_block_text, keyed by block type
+def _image_text(block: dict) -> str:
+    image_info = block["image"]
+    if image_info.get("type") == "external":
+        return f"Image: {image_info['external']['url']}"
+    elif image_info.get("type") == "file":
+        return f"Image: {image_info['file']['url']}"
+    return "Image (embedded)"
+
+
+def _unknown_block_text(block: dict) -> str:
+    return f"[{block.get('type', '').upper()}] content"
+
+
+_BLOCK_TEXT_EXTRACTORS: Dict[str, Callable[[dict], str]] = {
+    **dict.fromkeys(
+        ("paragraph", "heading_1", "heading_2", "heading_3", "bulleted_list_item",
+         "numbered_list_item", "to_do", "quote", "callout", "code"),
+        _block_text
+    ),
+    "divider": lambda block: "---",
+    "image": _image_text,
+    "embed": lambda block: f"Embed: {block['embed']['url']}",
+    "bookmark": lambda block: f"Bookmark: {block['bookmark']['url']}",
+}
+
+
+# Property value extractors for extract_properties, keyed by property type
+def _optional_field(value: Optional[dict], field: str) -> Any:
+    return value[field] if value else None
+
+
+_PROPERTY_EXTRACTORS: Dict[str, Callable[[dict], Any]] = {
+    "title": lambda prop: NotionUtils.extract_rich_text(prop["title"]),
+    "rich_text": lambda prop: NotionUtils.extract_rich_text(prop["rich_text"]),
+    "select": lambda prop: _optional_field(prop.get("select"), "name"),
+    "multi_select": lambda prop: [item["name"] for item in prop.get("multi_select", [])],
+    "date": lambda prop: _optional_field(prop.get("date"), "start"),
+    "number": lambda prop: prop.get("number"),
+    "checkbox": lambda prop: prop.get("checkbox"),
+    "url": lambda prop: prop.get("url"),
+    "email": lambda prop: prop.get("email"),
+    "phone_number": lambda prop: prop.get("phone_number"),
+}
@@ -4,13 +4,12 @@ Clean implementation using only Notion API - no MCP client complexity
 """
 
 import os
+import re
 import asyncio
-import json
-from typing import Any, Dict, List, Optional, Union
-from datetime import datetime, timedelta, timezone
+from typing import Optional
 from dotenv import load_dotenv
-from notion_client import Client
-from notion_client.errors import APIResponseError
+from notion_client import AsyncClient
+from .api_client import create_notion_client
 from .notion_utils import NotionUtils
 from .core_operations import CoreOperations
 from .analytics_operations import AnalyticsOperations
@@ -20,6 +19,54 @@ from .update_operations import UpdateOperations
 # Load environment variables first
 load_dotenv()
 
+# Routing keywords per category, in priority order (earlier categories win)
+_ROUTE_KEYWORDS = {
+    "read": ("read", "get", "show", "view"),
+    "search": ("search",),
+    "create": ("create",),
+    "update": ("update",),
+    "list": ("list",),
+    "analytics": ("analyze", "analytics", "metrics", "stats"),
+    "bulk": ("bulk", "multiple", "batch"),
+}
+_ROUTE_PRIORITY = {category: rank for rank, category in enumerate(_ROUTE_KEYWORDS)}
+_KEYWORD_ROUTES = {keyword: category for category, keywords in _ROUTE_KEYWORDS.items() for keyword in keywords}
+_ROUTER_RE = re.compile(r"\b(" + "|".join(_KEYWORD_ROUTES) + r")\b")
+
+# Help text, built once at import
+_HELP_TEXT = "\n".join([
+    "\n" + "=" * 60,
+    "🔧 COMPLETE NOTION SERVER V2 CAPABILITIES",
+    "=" * 60,
+    "\n📋 CORE OPERATIONS:",
+    "  • search [term] - Search pages and databases",
+    "  • read page [name/id] - Read page content",
+    "  • create page - Create new pages",
+    "  • update content - Add content to existing pages",
+    "  • list pages - List all pages",
+    "  • list databases - List all databases",
+    "\n📊 ANALYTICS & METRICS:",
+    "  • analyze workspace - Complete workspace analytics",
+    "  • analyze content - Content structure analysis",
+    "  • analyze activity - Recent activity patterns",
+    "  • analyze database - Database structure analysis",
+    "\n🔄 BULK OPERATIONS:",
+    "  • bulk pages - Bulk page operations",
+    "  • bulk database - Bulk database operations",
+    "\n💡 EXAMPLES:",
+    "  • 'search jaat'",
+    "  • 'read page jaat'",
+    "  • 'create page'",
+    "  • 'update content'",
+    "  • 'analyze workspace'",
+    "  • 'bulk pages'",
+    "  • 'list pages'",
+    "\n🔌 CONNECTION:",
+    "  • Direct Notion API: ✅ Always available",
+    "  • Clean implementation: ✅ No MCP complexity",
+    "\n" + "=" * 60,
+])
+
 
 class ComprehensiveNotionServer:
     """
@@ -30,9 +77,21 @@ class ComprehensiveNotionServer:
     - Production-ready error handling
     """
     
-    def __init__(self, notion_token: str):
+    __slots__ = (
+        "notion_token",
+        "notion",
+        "core_ops",
+        "analytics_ops",
+        "bulk_ops",
+        "update_ops",
+        "_route_handlers",
+        "_prefetch_task",
+    )
+    
+    def __init__(self, notion_token: str, client: Optional[AsyncClient] = None):
         self.notion_token = notion_token
-        self.notion = Client(auth=notion_token)
+        # Reuse an already-connected client (e.g. the one main() validated) when given
+        self.notion = client if client is not None else create_notion_client(notion_token)
         
         # Initialize operation classes
         self.core_ops = CoreOperations(self.notion)
@@ -40,6 +99,20 @@ class ComprehensiveNotionServer:
         self.bulk_ops = BulkOperations(self.notion)
         self.update_ops = UpdateOperations(self.notion)
         
+        # Handlers for each routing category in _ROUTE_KEYWORDS
+        self._route_handlers = {
+            "read": self._handle_read_request,
+            "search": self._handle_search_request,
+            "create": self._handle_create_request,
+            "update": self._handle_update_request,
+            "list": self._handle_list_request,
+            "analytics": self.analytics_ops.handle_analytics_requests,
+            "bulk": self.bulk_ops.handle_bulk_operations,
+        }
+        
+        # Background workspace scan, restarted before each prompt
+        self._prefetch_task: Optional[asyncio.Task] = None
+        
     async def run_enhanced_conversation(self):
         """Run interactive conversation with comprehensive capabilities"""
         
@@ -50,17 +123,20 @@ class ComprehensiveNotionServer:
         print("-" * 60)
         
         while True:
+            # Rescan the workspace while the user types, whenever the cached scans have expired
+            self._start_prefetch()
             try:
-                user_input = input("\n🤖 User: ").strip()
-            except KeyboardInterrupt:
+                user_input = (await NotionUtils.ainput("\n🤖 User: ")).strip()
+            except (KeyboardInterrupt, EOFError):
                 print("\n\n👋 Goodbye!")
                 break
             
-            if user_input.lower() in ['exit', 'quit', 'bye']:
+            lowered = user_input.lower()
+            if lowered in ['exit', 'quit', 'bye']:
                 print("\n👋 Goodbye!")
                 break
             
-            if user_input.lower() == 'help':
+            if lowered == 'help':
                 self.show_comprehensive_help()
                 continue
             
@@ -68,62 +144,22 @@ class ComprehensiveNotionServer:
                 continue
             
             # Route to appropriate handler
-            await self.route_user_request(user_input)
+            await self.route_user_request(user_input, lowered)
     
-    async def route_user_request(self, user_input: str):
-        """Route user request to appropriate handler"""
-        
-        # READ/GET OPERATIONS
-        if any(keyword in user_input.lower() for keyword in ['read', 'get', 'show', 'view']):
-            if 'page' in user_input.lower():
-                page_identifier = NotionUtils.extract_page_identifier(user_input)
-                if page_identifier:
-                    await self.core_ops.read_page_content(page_identifier)
-                else:
-                    await self.core_ops.read_page_interactive()
-            elif 'database' in user_input.lower():
-                database_id = input("Enter database ID: ").strip()
-                if database_id:
-                    await self.core_ops.read_database_content(database_id)
-            else:
-                print("What would you like to read?")
-                print("• read page [name/id] - Read page content")
-                print("• read database [id] - Read database content")
-        
-        # SEARCH OPERATIONS
-        elif 'search' in user_input.lower():
-            search_term = user_input.lower().replace('search', '').strip()
-            if not search_term:
-                search_term = input("Enter search term: ").strip()
-            await self.core_ops.search_content(search_term)
+    async def route_user_request(self, user_input: str, lowered: Optional[str] = None):
+        """Route user request to appropriate handler
         
-        # CREATE OPERATIONS
-        elif 'create' in user_input.lower():
-            if 'page' in user_input.lower():
-                await self.core_ops.create_page_interactive()
-            elif 'database' in user_input.lower():
-                await self.core_ops.create_database_interactive()
-            else:
-                print("What would you like to create?")
-                print("• create page - Create a new page")
-                print("• create database - Create a new database")
-        
-        # UPDATE OPERATIONS
-        elif 'update' in user_input.lower():
-            await self.update_ops.update_content_interactive()
-        
-        # LIST OPERATIONS
-        elif 'list' in user_input.lower():
-            await self.core_ops.list_content_interactive()
-        
-        # ANALYTICS WORKFLOWS
-        elif any(keyword in user_input.lower() for keyword in ['analyze', 'analytics', 'metrics', 'stats']):
-            await self.analytics_ops.handle_analytics_requests(user_input)
-        
-        # BULK OPERATIONS
-        elif any(keyword in user_input.lower() for keyword in ['bulk', 'multiple', 'batch']):
-            await self.bulk_ops.handle_bulk_operations(user_input)
+        Handlers receive the request text and its lowercased form, so the
+        text is lowercased once per request.
+        """
+        if lowered is None:
+            lowered = user_input.lower()
         
+        # Pick the highest-priority category among all keywords in one regex pass
+        categories = {_KEYWORD_ROUTES[keyword] for keyword in _ROUTER_RE.findall(lowered)}
+        if categories:
+            category = min(categories, key=_ROUTE_PRIORITY.__getitem__)
+            await self._route_handlers[category](user_input, lowered)
         else:
             print("💡 I can help you with:")
             print("• Search: 'search [term]'")
@@ -134,45 +170,71 @@ class ComprehensiveNotionServer:
             print("• Analytics: 'analyze workspace'")
             print("• Bulk operations: 'bulk pages'")
     
+    async def _handle_read_request(self, user_input: str, lowered: str):
+        """READ/GET OPERATIONS"""
+        if 'page' in lowered:
+            page_identifier = NotionUtils.extract_page_identifier(lowered)
+            if page_identifier:
+                await self.core_ops.read_page_content(page_identifier)
+            else:
+                await self.core_ops.read_page_interactive()
+        elif 'database' in lowered:
+            database_id = (await NotionUtils.ainput("Enter database ID: ")).strip()
+            if database_id:
+                await self.core_ops.read_database_content(database_id)
+        else:
+            print("What would you like to read?")
+            print("• read page [name/id] - Read page content")
+            print("• read database [id] - Read database content")
+    
+    async def _handle_search_request(self, user_input: str, lowered: str):
+        """SEARCH OPERATIONS"""
+        search_term = lowered.replace('search', '').strip()
+        if not search_term:
+            search_term = (await NotionUtils.ainput("Enter search term: ")).strip()
+        await self.core_ops.search_content(search_term)
+    
+    async def _handle_create_request(self, user_input: str, lowered: str):
+        """CREATE OPERATIONS"""
+        if 'page' in lowered:
+            await self.core_ops.create_page_interactive()
+        elif 'database' in lowered:
+            await self.core_ops.create_database_interactive()
+        else:
+            print("What would you like to create?")
+            print("• create page - Create a new page")
+            print("• create database - Create a new database")
+    
+    async def _handle_update_request(self, user_input: str, lowered: str):
+        """UPDATE OPERATIONS"""
+        await self.update_ops.update_content_interactive()
+    
+    async def _handle_list_request(self, user_input: str, lowered: str):
+        """LIST OPERATIONS"""
+        await self.core_ops.list_content_interactive()
+    
+    def _start_prefetch(self):
+        """Start a background workspace scan unless one is still running"""
+        if self._prefetch_task is None or self._prefetch_task.done():
+            self._prefetch_task = asyncio.create_task(self.analytics_ops.prefetch_workspace())
+    
+    async def stop_prefetch(self):
+        """Cancel the background workspace scan and wait for it to finish"""
+        task, self._prefetch_task = self._prefetch_task, None
+        if task is None:
+            return
+        task.cancel()
+        try:
+            await task
+        except (asyncio.CancelledError, Exception):
+            # The scan only warms caches, so how it ended does not matter
+            pass
+        # Scans the prefetch started keep running after it is cancelled, so stop them too
+        NotionUtils.cancel_running_scans()
+    
     def show_comprehensive_help(self):
         """Show comprehensive help information"""
-        print("\n" + "="*60)
-        print("🔧 COMPLETE NOTION SERVER V2 CAPABILITIES")
-        print("="*60)
-        
-        print("\n📋 CORE OPERATIONS:")
-        print("  • search [term] - Search pages and databases")
-        print("  • read page [name/id] - Read page content")
-        print("  • create page - Create new pages")
-        print("  • update content - Add content to existing pages")
-        print("  • list pages - List all pages")
-        print("  • list databases - List all databases")
-        
-        print("\n📊 ANALYTICS & METRICS:")
-        print("  • analyze workspace - Complete workspace analytics")
-        print("  • analyze content - Content structure analysis")
-        print("  • analyze activity - Recent activity patterns")
-        print("  • analyze database - Database structure analysis")
-        
-        print("\n🔄 BULK OPERATIONS:")
-        print("  • bulk pages - Bulk page operations")
-        print("  • bulk database - Bulk database operations")
-        
-        print("\n💡 EXAMPLES:")
-        print("  • 'search jaat'")
-        print("  • 'read page jaat'")
-        print("  • 'create page'")
-        print("  • 'update content'")
-        print("  • 'analyze workspace'")
-        print("  • 'bulk pages'")
-        print("  • 'list pages'")
-        
-        print("\n🔌 CONNECTION:")
-        print("  • Direct Notion API: ✅ Always available")
-        print("  • Clean implementation: ✅ No MCP complexity")
-        
-        print("\n" + "="*60)
-
+        NotionUtils.write_lines([_HELP_TEXT])
 
 # Main execution
 async def main():
@@ -188,22 +250,28 @@ async def main():
         
         # Test Notion API connection first
         print("🔗 Testing Notion API connection...")
+        test_client = create_notion_client(notion_token)
         try:
-            test_client = Client(auth=notion_token)
-            user_info = test_client.users.me()
+            user_info = await test_client.users.me()
             print(f"✅ Notion API connection successful! User: {user_info.get('name', 'N/A')}")
         except Exception as api_error:
+            await test_client.aclose()
             print(f"❌ Notion API connection failed: {api_error}")
             print("Please check your NOTION_TOKEN is valid")
             return 1
         
         # Create server
         print("🚀 Creating Notion server...")
-        server = ComprehensiveNotionServer(notion_token)
+        server = ComprehensiveNotionServer(notion_token, client=test_client)
         
         # Run interactive conversation
         print("▶️ Starting interactive conversation...")
-        await server.run_enhanced_conversation()
+        try:
+            await server.run_enhanced_conversation()
+        finally:
+            # Stop the background scan before its client goes away, then release the pooled connections
+            await server.stop_prefetch()
+            await server.notion.aclose()
         
     except KeyboardInterrupt:
         print("\n\n👋 Goodbye! (Interrupted)")
@@ -4,14 +4,14 @@ Handles all content update functionality including templates and block operation
 """
 
 from typing import List, Dict, Any
-from notion_client import Client
+from notion_client import AsyncClient
 from .notion_utils import NotionUtils
 
 
 class UpdateOperations:
     """Handle all update operations for Notion content"""
     
-    def __init__(self, notion_client: Client):
+    def __init__(self, notion_client: AsyncClient):
         self.notion = notion_client
     
     async def update_content_interactive(self):
@@ -20,7 +20,7 @@ class UpdateOperations:
         print("=" * 40)
         
         # Get page to update
-        page_id = input("Enter page ID or name to update: ").strip()
+        page_id = (await NotionUtils.ainput("Enter page ID or name to update: ")).strip()
         if not page_id:
             print("❌ Page ID/name required")
             return
@@ -28,7 +28,7 @@ class UpdateOperations:
         # If not a valid UUID, search for page
         if not NotionUtils.is_valid_uuid(page_id):
             try:
-                search_results = self.notion.search(
+                search_results = await self.notion.search(
                     query=page_id,
                     filter={"property": "object", "value": "page"}
                 )
@@ -45,7 +45,7 @@ class UpdateOperations:
                 
                 # Let user select
                 try:
-                    choice = int(input("\nSelect page number: ").strip()) - 1
+                    choice = int((await NotionUtils.ainput("\nSelect page number: ")).strip()) - 1
                     if 0 <= choice < len(search_results["results"]):
                         page_id = search_results["results"][choice]["id"]
                         page_title = NotionUtils.extract_title(search_results["results"][choice])
@@ -62,7 +62,7 @@ class UpdateOperations:
         else:
             # Get page title for valid UUID
             try:
-                page = self.notion.pages.retrieve(page_id=page_id)
+                page = await NotionUtils.retrieve_page(self.notion, page_id)
                 page_title = NotionUtils.extract_title(page)
             except Exception as e:
                 print(f"❌ Error retrieving page: {str(e)}")
@@ -74,7 +74,7 @@ class UpdateOperations:
             # Show current content (first few blocks)
             print("\n📋 Current content (first 5 blocks):")
             try:
-                blocks = self.notion.blocks.children.list(
+                blocks = await self.notion.blocks.children.list(
                     block_id=page_id,
                     page_size=5
                 )
@@ -99,7 +99,7 @@ class UpdateOperations:
             print("5. Add template content")
             print("6. Add custom block")
             
-            choice = input("\nSelect option (1-6): ").strip()
+            choice = (await NotionUtils.ainput("\nSelect option (1-6): ")).strip()
             
             if choice == "1":
                 await self._add_paragraph_block(page_id)
@@ -121,13 +121,13 @@ class UpdateOperations:
     
     async def _add_paragraph_block(self, page_id: str):
         """Add a paragraph block to the page"""
-        content = input("Enter paragraph text: ").strip()
+        content = (await NotionUtils.ainput("Enter paragraph text: ")).strip()
         if not content:
             print("❌ Text required")
             return
         
         try:
-            response = self.notion.blocks.children.append(
+            response = await self.notion.blocks.children.append(
                 block_id=page_id,
                 children=[
                     {
@@ -144,6 +144,7 @@ class UpdateOperations:
                     }
                 ]
             )
+            NotionUtils.invalidate_search_cache()
             print(f"✅ Added paragraph block successfully!")
             
         except Exception as e:
@@ -151,12 +152,12 @@ class UpdateOperations:
     
     async def _add_heading_block(self, page_id: str):
         """Add a heading block to the page"""
-        content = input("Enter heading text: ").strip()
+        content = (await NotionUtils.ainput("Enter heading text: ")).strip()
         if not content:
             print("❌ Text required")
             return
         
-        heading_level = input("Heading level (1-3, default 1): ").strip()
+        heading_level = (await NotionUtils.ainput("Heading level (1-3, default 1): ")).strip()
         if not heading_level:
             heading_level = "1"
         
@@ -164,7 +165,7 @@ class UpdateOperations:
         heading_type = heading_types.get(heading_level, "heading_1")
         
         try:
-            response = self.notion.blocks.children.append(
+            response = await self.notion.blocks.children.append(
                 block_id=page_id,
                 children=[
                     {
@@ -181,6 +182,7 @@ class UpdateOperations:
                     }
                 ]
             )
+            NotionUtils.invalidate_search_cache()
             print(f"✅ Added {heading_type} block successfully!")
             
         except Exception as e:
@@ -188,13 +190,13 @@ class UpdateOperations:
     
     async def _add_bullet_block(self, page_id: str):
         """Add a bulleted list item block to the page"""
-        content = input("Enter bullet point text: ").strip()
+        content = (await NotionUtils.ainput("Enter bullet point text: ")).strip()
         if not content:
             print("❌ Text required")
             return
         
         try:
-            response = self.notion.blocks.children.append(
+            response = await self.notion.blocks.children.append(
                 block_id=page_id,
                 children=[
                     {
@@ -211,6 +213,7 @@ class UpdateOperations:
                     }
                 ]
             )
+            NotionUtils.invalidate_search_cache()
             print(f"✅ Added bullet point successfully!")
             
         except Exception as e:
@@ -218,13 +221,13 @@ class UpdateOperations:
     
     async def _add_todo_block(self, page_id: str):
         """Add a to-do block to the page"""
-        content = input("Enter to-do text: ").strip()
+        content = (await NotionUtils.ainput("Enter to-do text: ")).strip()
         if not content:
             print("❌ Text required")
             return
         
         try:
-            response = self.notion.blocks.children.append(
+            response = await self.notion.blocks.children.append(
                 block_id=page_id,
                 children=[
                     {
@@ -242,6 +245,7 @@ class UpdateOperations:
                     }
                 ]
             )
+            NotionUtils.invalidate_search_cache()
             print(f"✅ Added to-do item successfully!")
             
         except Exception as e:
@@ -258,8 +262,8 @@ class UpdateOperations:
         print("• quote")
         print("• callout")
         
-        block_type = input("Enter block type: ").strip()
-        content = input("Enter content: ").strip()
+        block_type = (await NotionUtils.ainput("Enter block type: ")).strip()
+        content = (await NotionUtils.ainput("Enter content: ")).strip()
         
         if not block_type or not content:
             print("❌ Block type and content required")
@@ -308,7 +312,7 @@ class UpdateOperations:
             return
         
         try:
-            response = self.notion.blocks.children.append(
+            response = await self.notion.blocks.children.append(
                 block_id=page_id,
                 children=[
                     {
@@ -318,6 +322,7 @@ class UpdateOperations:
                     }
                 ]
             )
+            NotionUtils.invalidate_search_cache()
             print(f"✅ Added {block_type} block successfully!")
             
         except Exception as e:
@@ -335,7 +340,7 @@ class UpdateOperations:
             print("3. AWS Integration Patterns")
             print("4. AWS Security Best Practices")
             
-            choice = input("Select template (1-4): ").strip()
+            choice = (await NotionUtils.ainput("Select template (1-4): ")).strip()
             
             if choice == "1":
                 await self._add_aws_agent_template(page_id)
@@ -353,7 +358,7 @@ class UpdateOperations:
             print("2. Agent Workflow Design")
             print("3. Tool Integration Guide")
             
-            choice = input("Select template (1-3): ").strip()
+            choice = (await NotionUtils.ainput("Select template (1-3): ")).strip()
             
             if choice == "1":
                 await self._add_ai_architecture_template(page_id)
@@ -931,4 +936,5 @@ class UpdateOperations:
             await self.notion.blocks.children.append(
                 block_id=page_id,
                 children=chunk
-            ) 
\ No newline at end of file
+            )
+        NotionUtils.invalidate_search_cache() 
\ No newline at end of file
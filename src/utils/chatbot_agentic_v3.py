@@ -2,6 +2,7 @@ import os
 import uuid
 import json
 import asyncio
+import threading
 from dotenv import load_dotenv
 from openai import OpenAI
 from traceback import format_exc
@@ -16,7 +17,7 @@ from utils.config import Config
 from utils.vector_db_manager import VectorDBManager
 
 # Import Notion ServerV2 components
-from notion_client import Client
+from notion_mcp_server.api_client import create_notion_client, create_notion_sync_client
 from notion_mcp_server.core_operations import CoreOperations
 from notion_mcp_server.analytics_operations import AnalyticsOperations
 from notion_mcp_server.bulk_operations import BulkOperations
@@ -59,15 +60,22 @@ class Chatbot:
         # Initialize Notion ServerV2 components
         self.notion_token = os.getenv("NOTION_API_KEY") or os.getenv("NOTION_TOKEN")
         if self.notion_token:
-            self.notion_client = Client(auth=self.notion_token)
-            self.notion_core = CoreOperations(self.notion_client)
-            self.notion_analytics = AnalyticsOperations(self.notion_client)
-            self.notion_bulk = BulkOperations(self.notion_client)
-            self.notion_update = UpdateOperations(self.notion_client)
+            self.notion_client = create_notion_sync_client(self.notion_token)
+            # The ServerV2 operation classes share one async client, and so one connection
+            # pool and rate limiter, driven by a single event loop on a background thread
+            self.notion_async_client = create_notion_client(self.notion_token)
+            self.notion_loop = asyncio.new_event_loop()
+            threading.Thread(target=self.notion_loop.run_forever, daemon=True).start()
+            self.notion_core = CoreOperations(self.notion_async_client)
+            self.notion_analytics = AnalyticsOperations(self.notion_async_client)
+            self.notion_bulk = BulkOperations(self.notion_async_client)
+            self.notion_update = UpdateOperations(self.notion_async_client)
             print("✅ Notion ServerV2 initialized successfully!")
         else:
             print("⚠️  Notion token not found. Notion functionality will be disabled.")
             self.notion_client = None
+            self.notion_async_client = None
+            self.notion_loop = None
         
         # Setup agent functions with Notion tools
         self.agent_functions = [
@@ -108,6 +116,28 @@ class Chatbot:
             ])
         
         
+    def run_notion(self, coro):
+        """
+        Runs a coroutine on the shared Notion event loop and waits for its result.
+
+        Args:
+            coro: The coroutine to run, typically a ServerV2 operation.
+
+        Returns:
+            The coroutine's result.
+        """
+        return asyncio.run_coroutine_threadsafe(coro, self.notion_loop).result()
+
+    def close(self):
+        """
+        Closes the Notion clients and stops the shared Notion event loop.
+        """
+        if self.notion_client:
+            self.run_notion(self.notion_async_client.aclose())
+            self.notion_loop.call_soon_threadsafe(self.notion_loop.stop)
+            self.notion_client.close()
+            self.notion_client = None
+
     def execute_function_call(self, function_name: str, function_args: dict) -> tuple[str, str]:
         """
         Executes the requested function based on the function name and arguments.
@@ -705,7 +735,7 @@ class Chatbot:
         try:
             # Get a suitable parent if not provided
             if not parent_id:
-                parent_id = NotionUtils.get_suitable_parent_sync(self.notion_client)
+                parent_id = self.run_notion(NotionUtils.get_suitable_parent(self.notion_async_client))
                 if not parent_id:
                     return "Function call failed.", "No suitable parent page found. Please specify a parent_id."
             
@@ -724,6 +754,7 @@ class Chatbot:
                 }]
             
             page = self.notion_client.pages.create(**page_data)
+            NotionUtils.invalidate_search_cache()
             
             result_text = f"✅ Page created successfully!\n"
             result_text += f"📄 Title: {title}\n"
@@ -809,13 +840,6 @@ class Chatbot:
             return "Function call failed.", "Notion client not initialized. Please check your NOTION_TOKEN."
         
         try:
-            # Get data using asyncio
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            
-            # Create a temporary analytics instance
-            analytics = AnalyticsOperations(self.notion_client)
-            
             # Capture the output
             import io
             import sys
@@ -823,7 +847,7 @@ class Chatbot:
             sys.stdout = captured_output = io.StringIO()
             
             # Run analytics
-            loop.run_until_complete(analytics.run_workspace_analytics())
+            self.run_notion(self.notion_analytics.run_workspace_analytics())
             
             # Restore stdout and get result
             sys.stdout = old_stdout
@@ -845,13 +869,6 @@ class Chatbot:
             return "Function call failed.", "Notion client not initialized. Please check your NOTION_TOKEN."
         
         try:
-            # Get data using asyncio
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            
-            # Create a temporary analytics instance
-            analytics = AnalyticsOperations(self.notion_client)
-            
             # Capture the output
             import io
             import sys
@@ -859,7 +876,7 @@ class Chatbot:
             sys.stdout = captured_output = io.StringIO()
             
             # Run analytics
-            loop.run_until_complete(analytics.run_content_analytics())
+            self.run_notion(self.notion_analytics.run_content_analytics())
             
             # Restore stdout and get result
             sys.stdout = old_stdout
@@ -881,13 +898,6 @@ class Chatbot:
             return "Function call failed.", "Notion client not initialized. Please check your NOTION_TOKEN."
         
         try:
-            # Get data using asyncio
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            
-            # Create a temporary analytics instance
-            analytics = AnalyticsOperations(self.notion_client)
-            
             # Capture the output
             import io
             import sys
@@ -895,7 +905,7 @@ class Chatbot:
             sys.stdout = captured_output = io.StringIO()
             
             # Run analytics
-            loop.run_until_complete(analytics.run_activity_analytics())
+            self.run_notion(self.notion_analytics.run_activity_analytics())
             
             # Restore stdout and get result
             sys.stdout = old_stdout
@@ -960,6 +970,7 @@ class Chatbot:
                         }
                     ]
                 )
+                NotionUtils.invalidate_search_cache()
                 return "Function call successful.", f"✅ Added paragraph to page {page_id}"
             else:
                 # Split into multiple paragraphs
@@ -1015,6 +1026,7 @@ class Chatbot:
                     block_id=page_id,
                     children=paragraphs
                 )
+                NotionUtils.invalidate_search_cache()
                 
                 return "Function call successful.", f"✅ Added {len(paragraphs)} paragraphs to page {page_id} (content was split due to length limit)"
             
@@ -1084,6 +1096,7 @@ class Chatbot:
                     }
                 ]
             )
+            NotionUtils.invalidate_search_cache()
             
             return "Function call successful.", f"✅ Added {heading_type} to page {page_id}{truncated_warning}"
             
@@ -1172,6 +1185,7 @@ class Chatbot:
                     block_id=page_id,
                     children=bullet_points
                 )
+                NotionUtils.invalidate_search_cache()
                 
                 return "Function call successful.", f"✅ Added {len(bullet_points)} bullet points to page {page_id} (content was split due to length limit)"
             else:
@@ -1193,6 +1207,7 @@ class Chatbot:
                         }
                     ]
                 )
+                NotionUtils.invalidate_search_cache()
                 
                 return "Function call successful.", f"✅ Added bullet point to page {page_id}"
             
@@ -1283,6 +1298,7 @@ class Chatbot:
                     block_id=page_id,
                     children=todo_items
                 )
+                NotionUtils.invalidate_search_cache()
                 
                 return "Function call successful.", f"✅ Added {len(todo_items)} to-do items to page {page_id} (content was split due to length limit)"
             else:
@@ -1305,6 +1321,7 @@ class Chatbot:
                         }
                     ]
                 )
+                NotionUtils.invalidate_search_cache()
                 
                 return "Function call successful.", f"✅ Added to-do item to page {page_id}"
             
@@ -1420,6 +1437,7 @@ class Chatbot:
                 block_id=page_id,
                 children=todo_blocks
             )
+            NotionUtils.invalidate_search_cache()
             
             return "Function call successful.", f"✅ Added {len(todo_blocks)} to-do items to page {page_id}"
             
@@ -1440,15 +1458,8 @@ class Chatbot:
             return "Function call failed.", "Notion client not initialized. Please check your NOTION_TOKEN."
         
         try:
-            # Get data using asyncio
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            
-            # Create a temporary bulk operations instance
-            bulk_ops = BulkOperations(self.notion_client)
-            
             # Run bulk creation
-            result = loop.run_until_complete(bulk_ops.bulk_create_pages(pages_data))
+            result = self.run_notion(self.notion_bulk.bulk_create_pages(pages_data))
             
             result_text = f"🔄 Bulk Page Creation Results:\n"
             result_text += f"✅ Created: {len(result['created'])} pages\n"
@@ -1480,13 +1491,6 @@ class Chatbot:
             return "Function call failed.", "Notion client not initialized. Please check your NOTION_TOKEN."
         
         try:
-            # Get data using asyncio
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            
-            # Create a temporary bulk operations instance
-            bulk_ops = BulkOperations(self.notion_client)
-            
             # Capture the output
             import io
             import sys
@@ -1494,7 +1498,7 @@ class Chatbot:
             sys.stdout = captured_output = io.StringIO()
             
             # Run bulk listing
-            loop.run_until_complete(bulk_ops.bulk_list_pages())
+            self.run_notion(self.notion_bulk.bulk_list_pages())
             
             # Restore stdout and get result
             sys.stdout = old_stdout
@@ -1519,13 +1523,6 @@ class Chatbot:
             return "Function call failed.", "Notion client not initialized. Please check your NOTION_TOKEN."
         
         try:
-            # Get data using asyncio
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            
-            # Create a temporary bulk operations instance
-            bulk_ops = BulkOperations(self.notion_client)
-            
             # Capture the output
             import io
             import sys
@@ -1533,7 +1530,7 @@ class Chatbot:
             sys.stdout = captured_output = io.StringIO()
             
             # Run bulk analysis
-            loop.run_until_complete(bulk_ops.bulk_analyze_pages())
+            self.run_notion(self.notion_bulk.bulk_analyze_pages())
             
             # Restore stdout and get result
             sys.stdout = old_stdout